@@ -1,5 +1,6 @@
 import os
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
 from garminconnect import Garmin
 from notion_client import Client
 
@@ -12,6 +13,12 @@ DATABASE_ID = os.environ.get("NOTION_STEPS_DB_ID")
 # Number of days to fetch (adjust as needed - 730 = ~2 years)
 DAYS_TO_FETCH = 730
 
+# Days re-checked before the latest synced date to catch late-arriving data
+OVERLAP_DAYS = 3
+
+# Parallel Garmin requests (Notion writes stay on the main thread)
+MAX_WORKERS = 16
+
 
 def daily_steps_exist(client, database_id, steps_date):
     """Check if steps data already exists for a given date."""
@@ -27,6 +34,29 @@ def daily_steps_exist(client, database_id, steps_date):
     return len(query["results"]) > 0
 
 
+def fetch_existing_step_dates(client, database_id):
+    """Return the set of ISO dates already present in the steps database.
+
+    Pages through the whole database once (100 rows per request) instead of
+    issuing one existence query per day.
+    """
+    existing_dates = set()
+    cursor = None
+    while True:
+        query_args = {"database_id": database_id, "page_size": 100}
+        if cursor:
+            query_args["start_cursor"] = cursor
+        query = client.databases.query(**query_args)
+        for page in query["results"]:
+            date_prop = page["properties"].get("Date", {}).get("date")
+            if date_prop and date_prop.get("start"):
+                existing_dates.add(date_prop["start"][:10])
+        if not query.get("has_more"):
+            break
+        cursor = query.get("next_cursor")
+    return existing_dates
+
+
 def write_to_notion(client, database_id, steps_data, steps_date):
     """Write steps data to Notion database."""
     total_steps = steps_data.get("totalSteps", 0)
@@ -73,32 +103,60 @@ def main():
     skipped_count = 0
     error_count = 0
     
-    print(f"Fetching steps data for the last {DAYS_TO_FETCH} days...")
+    # Load existing dates once; fall back to per-day checks if that fails
+    try:
+        existing_dates = fetch_existing_step_dates(notion, DATABASE_ID)
+    except Exception as e:
+        print(f"Could not prefetch existing dates, checking per day: {e}")
+        existing_dates = None
+    
+    # Incremental: only walk back to the latest synced date (plus overlap).
+    # DAYS_TO_FETCH remains the cap for the first-run backfill.
+    days_needed = DAYS_TO_FETCH
+    if existing_dates:
+        latest = date.fromisoformat(max(existing_dates))
+        days_needed = max(1, min(DAYS_TO_FETCH, (today - latest).days + OVERLAP_DAYS))
+    
+    print(f"Fetching steps data for the last {days_needed} days...")
     
-    for i in range(DAYS_TO_FETCH):
+    missing_dates = []
+    for i in range(days_needed):
         current_date = today - timedelta(days=i)
         date_str = current_date.isoformat()
         
         try:
             # Check if already exists
-            if daily_steps_exist(notion, DATABASE_ID, date_str):
-                skipped_count += 1
-                continue
-            
-            # Fetch from Garmin
-            steps_data = garmin.get_user_summary(date_str)
-            
-            if steps_data and steps_data.get("totalSteps", 0) > 0:
-                write_to_notion(notion, DATABASE_ID, steps_data, date_str)
-                added_count += 1
-                print(f"Created steps entry for: {date_str} ({steps_data.get('totalSteps', 0)} steps)")
+            if existing_dates is not None:
+                already_synced = date_str in existing_dates
             else:
+                already_synced = daily_steps_exist(notion, DATABASE_ID, date_str)
+            if already_synced:
                 skipped_count += 1
-                
+                continue
+            missing_dates.append(date_str)
         except Exception as e:
             error_count += 1
-            if "404" not in str(e) and "No data" not in str(e):
-                print(f"Error fetching {date_str}: {e}")
+            print(f"Error checking {date_str}: {e}")
+    
+    # Fetch missing days from Garmin concurrently, write each as it arrives
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(garmin.get_user_summary, d): d for d in missing_dates}
+        for future in as_completed(futures):
+            date_str = futures[future]
+            try:
+                steps_data = future.result()
+                
+                if steps_data and steps_data.get("totalSteps", 0) > 0:
+                    write_to_notion(notion, DATABASE_ID, steps_data, date_str)
+                    added_count += 1
+                    print(f"Created steps entry for: {date_str} ({steps_data.get('totalSteps', 0)} steps)")
+                else:
+                    skipped_count += 1
+                    
+            except Exception as e:
+                error_count += 1
+                if "404" not in str(e) and "No data" not in str(e):
+                    print(f"Error fetching {date_str}: {e}")
     
     print(f"\nSteps sync complete: {added_count} added, {skipped_count} skipped, {error_count} errors")
 
@@ -1,12 +1,22 @@
-from datetime import datetime, timezone, timedelta
-from garminconnect import Garmin
-from notion_client import Client
-from dotenv import load_dotenv
-import pytz
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, time, timezone, timedelta
+from functools import lru_cache
+from pathlib import Path
+from zoneinfo import ZoneInfo
+import hashlib
 import os
+import queue
+import sqlite3
+import sys
+import threading
+
+from notion_common import (
+    NOTION_CREATE_RETRY_STATUSES, diff_properties, property_value, read_sync_hash, tag_sync_hash,
+    with_rate_limit_retry,
+)
 
 # Your local time zone - Belgium
-local_tz = pytz.timezone('Europe/Brussels')
+local_tz = ZoneInfo('Europe/Brussels')
 
 ACTIVITY_ICONS = {
     "Barre": "https://img.icons8.com/?size=100&id=66924&format=png&color=000000",
@@ -35,6 +45,13 @@ MULTIPLE_MATCH = "MULTIPLE_MATCH"
 # DRY_RUN will be set in main() after load_dotenv()
 DRY_RUN = False
 
+# Concurrent Notion writes; notion_common's rate limiter keeps all requests
+# at Notion's ~3 requests/second sustained limit
+NOTION_WRITE_WORKERS = 3
+
+# Window fetched on the first incremental run, before anything is cached
+FIRST_RUN_DAYS = 730
+
 
 def approx_equal(a, b, eps=0.01):
     """Compare two numbers with tolerance to avoid float comparison issues."""
@@ -47,56 +64,69 @@ def get_all_activities(garmin, limit=10000):
     """
     Fetch all activities from Garmin with pagination.
     Default limit is 10000 to cover full history.
+    The next batch is requested while the current one is being collected.
     """
     all_activities = []
     start = 0
     batch_size = 200  # Garmin API optimal batch size
     
-    while True:
-        chunk = garmin.get_activities(start, batch_size)
-        if not chunk:
-            break
-        all_activities.extend(chunk)
-        start += batch_size
-        if len(all_activities) >= limit:
-            break
+    # Two workers: one request in flight ahead of the one being consumed
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        current = executor.submit(garmin.get_activities, start, batch_size)
+        while True:
+            upcoming = executor.submit(garmin.get_activities, start + batch_size, batch_size)
+            chunk = current.result()
+            if not chunk:
+                break
+            all_activities.extend(chunk)
+            start += batch_size
+            if len(all_activities) >= limit:
+                break
+            current = upcoming
     
     return all_activities[:limit]
 
 
-def format_activity_type(activity_type, activity_name=""):
-    formatted_type = activity_type.replace('_', ' ').title() if activity_type else "Unknown"
-    activity_subtype = formatted_type
-    activity_type = formatted_type
-
-    activity_mapping = {
-        "Barre": "Strength",
-        "Indoor Cardio": "Cardio",
-        "Indoor Cycling": "Cycling",
-        "Indoor Rowing": "Rowing",
-        "Speed Walking": "Walking",
-        "Strength Training": "Strength",
-        "Treadmill Running": "Running"
-    }
 
-    if formatted_type == "Rowing V2":
-        activity_type = "Rowing"
-    elif formatted_type in ["Yoga", "Pilates"]:
-        activity_type = "Yoga/Pilates"
-        activity_subtype = formatted_type
+def get_activities_since(garmin, since):
+    """
+    Fetch only the activities started on or after `since` (a local date).
+    Used for incremental runs instead of paging through the full history.
+    """
+    today = datetime.now(local_tz).date()
+    return garmin.get_activities_by_date(since.isoformat(), today.isoformat())
+
+# Garmin type (title-cased) -> (Activity Type, Subactivity Type)
+ACTIVITY_TYPE_MAPPING = {
+    "Barre": ("Strength", "Barre"),
+    "Indoor Cardio": ("Cardio", "Indoor Cardio"),
+    "Indoor Cycling": ("Cycling", "Indoor Cycling"),
+    "Indoor Rowing": ("Rowing", "Indoor Rowing"),
+    "Pilates": ("Yoga/Pilates", "Pilates"),
+    "Rowing V2": ("Rowing", "Rowing V2"),
+    "Speed Walking": ("Walking", "Speed Walking"),
+    "Strength Training": ("Strength", "Strength Training"),
+    "Treadmill Running": ("Running", "Treadmill Running"),
+    "Yoga": ("Yoga/Pilates", "Yoga"),
+}
 
-    if formatted_type in activity_mapping:
-        activity_type = activity_mapping[formatted_type]
-        activity_subtype = formatted_type
+# Activity name keywords that override the Garmin type, checked in order
+_NAME_OVERRIDES = (
+    ("meditation", ("Meditation", "Meditation")),
+    ("barre", ("Strength", "Barre")),
+    ("stretch", ("Stretching", "Stretching")),
+)
 
-    if activity_name and "meditation" in activity_name.lower():
-        return "Meditation", "Meditation"
-    if activity_name and "barre" in activity_name.lower():
-        return "Strength", "Barre"
-    if activity_name and "stretch" in activity_name.lower():
-        return "Stretching", "Stretching"
-    
-    return activity_type, activity_subtype
+
+def format_activity_type(activity_type, activity_name=""):
+    if activity_name:
+        name_lc = activity_name.lower()
+        for keyword, types in _NAME_OVERRIDES:
+            if keyword in name_lc:
+                return types
+
+    formatted_type = activity_type.replace('_', ' ').title() if activity_type else "Unknown"
+    return ACTIVITY_TYPE_MAPPING.get(formatted_type, (formatted_type, formatted_type))
 
 
 def format_entertainment(activity_name):
@@ -105,20 +135,25 @@ def format_entertainment(activity_name):
     return activity_name.replace('ENTERTAINMENT', 'Netflix')
 
 
+TRAINING_MESSAGES = {
+    'NO_': 'No Benefit',
+    'MINOR_': 'Some Benefit',
+    'RECOVERY_': 'Recovery',
+    'MAINTAINING_': 'Maintaining',
+    'IMPROVING_': 'Impacting',
+    'IMPACTING_': 'Impacting',
+    'HIGHLY_': 'Highly Impacting',
+    'OVERREACHING_': 'Overreaching'
+}
+
+# (prefix, label) pairs, longest prefix first so the most specific match wins
+_TRAINING_MESSAGE_PREFIXES = tuple(sorted(TRAINING_MESSAGES.items(), key=lambda kv: -len(kv[0])))
+
+
 def format_training_message(message):
     if not message:
         return "Unknown"
-    messages = {
-        'NO_': 'No Benefit',
-        'MINOR_': 'Some Benefit',
-        'RECOVERY_': 'Recovery',
-        'MAINTAINING_': 'Maintaining',
-        'IMPROVING_': 'Impacting',
-        'IMPACTING_': 'Impacting',
-        'HIGHLY_': 'Highly Impacting',
-        'OVERREACHING_': 'Overreaching'
-    }
-    for key, value in messages.items():
+    for key, value in _TRAINING_MESSAGE_PREFIXES:
         if message.startswith(key):
             return value
     return message
@@ -154,6 +189,17 @@ def parse_utc_datetime(dt_str):
     if not dt_str:
         return None
     
+    # Fast path for Garmin's usual layout: "YYYY-MM-DDTHH:MM:SS" with an optional ".0"
+    if (len(dt_str) == 19 or (len(dt_str) == 21 and dt_str[-2:] == '.0')) and dt_str[10] in 'T ':
+        try:
+            return datetime(
+                int(dt_str[0:4]), int(dt_str[5:7]), int(dt_str[8:10]),
+                int(dt_str[11:13]), int(dt_str[14:16]), int(dt_str[17:19]),
+                tzinfo=timezone.utc
+            )
+        except ValueError:
+            pass  # Not what it looked like - use the generic path
+    
     s = dt_str.strip()
     
     # Remove trailing Z and replace with +00:00
@@ -213,10 +259,14 @@ def get_local_date_range(gmt_datetime_str):
         next_day = (datetime.fromisoformat(date_str) + timedelta(days=1)).strftime('%Y-%m-%d')
         return date_str, next_day
     
-    dt_local = dt_utc.astimezone(local_tz)
-    
+    return _local_day_bounds(dt_utc.astimezone(local_tz).date())
+
+
+@lru_cache(maxsize=4096)
+def _local_day_bounds(local_date):
+    """(start_iso, end_iso) of a local day; many activities share a day."""
     # Start of local day (00:00:00)
-    start_of_day = dt_local.replace(hour=0, minute=0, second=0, microsecond=0)
+    start_of_day = datetime.combine(local_date, time(), tzinfo=local_tz)
     
     # End of local day (next day 00:00:00)
     end_of_day = start_of_day + timedelta(days=1)
@@ -224,11 +274,153 @@ def get_local_date_range(gmt_datetime_str):
     return start_of_day.isoformat(), end_of_day.isoformat()
 
 
+# ============================================================================
+# Notion index - one paginated scan instead of one query per activity
+# ============================================================================
+
+_END_OF_PAGES = object()
+
+
+def query_all_pages(client, database_id, **query_args):
+    """
+    Yield every page of a Notion database query, following next_cursor.
+    A background thread requests the next batch while the caller is still
+    processing the current one, hiding most of the round-trip time.
+    """
+    batches = queue.Queue(maxsize=2)
+    
+    def produce():
+        cursor = None
+        try:
+            while True:
+                args = dict(query_args, database_id=database_id, page_size=100)
+                if cursor:
+                    args["start_cursor"] = cursor
+                query = with_rate_limit_retry(client.databases.query, **args)
+                batches.put(query.get('results', []))
+                if not query.get('has_more'):
+                    break
+                cursor = query.get('next_cursor')
+        except Exception as e:
+            batches.put(e)
+            return
+        batches.put(_END_OF_PAGES)
+    
+    threading.Thread(target=produce, daemon=True).start()
+    
+    while True:
+        batch = batches.get()
+        if batch is _END_OF_PAGES:
+            return
+        if isinstance(batch, Exception):
+            raise batch
+        yield from batch
+
+
+def _local_date_of(date_start):
+    """Local (Europe/Brussels) YYYY-MM-DD for a Notion Date start value."""
+    try:
+        dt = datetime.fromisoformat(date_start.replace('Z', '+00:00'))
+    except ValueError:
+        return date_start[:10]
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(local_tz)
+    return dt.date().isoformat()
+
+
+def _match_result(pages):
+    """Turn a list of candidate pages into page / collision tuple / None."""
+    if not pages:
+        return None
+    elif len(pages) == 1:
+        return pages[0]
+    else:
+        # Return collision with page IDs for debugging
+        page_ids = [p['id'] for p in pages[:5]]  # First 5 for logging
+        return (MULTIPLE_MATCH, page_ids)
+
+
+def has_sync_hash_column(client, database_id):
+    """True when the Activities database has the optional "Sync Hash" property."""
+    try:
+        schema = with_rate_limit_retry(client.databases.retrieve, database_id=database_id)
+    except Exception as e:
+        print(f"Could not read database schema: {e}")
+        return False
+    return "Sync Hash" in schema.get('properties', {})
+
+
+def load_all_notion_activities(client, database_id):
+    """
+    Fetch every activity page once and index it for local lookups.
+    
+    Returns:
+        - by_garmin_id: {garmin_id: [pages]}
+        - by_date_type_name: {(local_date, activity_type, activity_name): [pages]}
+    """
+    return index_notion_pages(query_all_pages(client, database_id))
+
+
+def probe_filter(activity):
+    """
+    Query filter for the pages a normalized activity could already have in
+    Notion: its Garmin ID, or legacy pages without one around the same day.
+    """
+    by_id = {"property": "Garmin ID", "number": {"equals": activity['garmin_id']}}
+    try:
+        day = date.fromisoformat((activity['date_local'] or '')[:10])
+    except ValueError:
+        return by_id
+    # One day either side covers the UTC/local shift; the fallback key is exact
+    return {"or": [by_id, {"and": [
+        {"property": "Garmin ID", "number": {"is_empty": True}},
+        {"property": "Date", "date": {"on_or_after": (day - timedelta(days=1)).isoformat()}},
+        {"property": "Date", "date": {"on_or_before": (day + timedelta(days=1)).isoformat()}},
+    ]}]}
+
+
+def probe_notion_activities(client, database_id, activities):
+    """
+    Index only the pages that could match activities (see probe_filter),
+    one small query each instead of a full scan. Same result shape as
+    load_all_notion_activities.
+    """
+    pages = {}
+    for activity in activities:
+        for page in query_all_pages(client, database_id, filter=probe_filter(activity)):
+            pages[page['id']] = page  # Same-day probes can return a page twice
+    return index_notion_pages(pages.values())
+
+
+def index_notion_pages(pages):
+    """Index activity pages by Garmin ID and by (local date, type, name)."""
+    by_garmin_id = {}
+    by_date_type_name = {}
+    
+    for page in pages:
+        props = page.get('properties', {})
+        
+        garmin_id = safe_get_number(props, 'Garmin ID', None)
+        if garmin_id is not None:
+            by_garmin_id.setdefault(int(garmin_id), []).append(page)
+        
+        date_prop = props.get('Date', {}).get('date') or {}
+        if date_prop.get('start'):
+            key = (
+                _local_date_of(date_prop['start']),
+                safe_get_select(props, 'Activity Type', ''),
+                safe_get_title(props, 'Activity Name', ''),
+            )
+            by_date_type_name.setdefault(key, []).append(page)
+    
+    return by_garmin_id, by_date_type_name
+
+
 # ============================================================================
 # Collision guard - handle multiple matches
 # ============================================================================
 
-def activity_exists_by_garmin_id(client, database_id, garmin_activity_id):
+def activity_exists_by_garmin_id(by_garmin_id, garmin_activity_id):
     """
     Check if an activity exists using the unique Garmin Activity ID.
     
@@ -240,29 +432,13 @@ def activity_exists_by_garmin_id(client, database_id, garmin_activity_id):
     if garmin_activity_id is None:
         return None
     
-    query = client.databases.query(
-        database_id=database_id,
-        filter={
-            "property": "Garmin ID",
-            "number": {"equals": int(garmin_activity_id)}
-        }
-    )
-    results = query.get('results', [])
-    
-    if len(results) == 0:
-        return None
-    elif len(results) == 1:
-        return results[0]
-    else:
-        # Return collision with page IDs for debugging
-        page_ids = [r['id'] for r in results[:5]]  # First 5 for logging
-        return (MULTIPLE_MATCH, page_ids)
+    return _match_result(by_garmin_id.get(int(garmin_activity_id)))
 
 
-def activity_exists_by_date_fallback(client, database_id, activity_date_gmt, activity_type, activity_name):
+def activity_exists_by_date_fallback(by_date_type_name, activity_date_gmt, activity_type, activity_name):
     """
     Fallback method for activities without Garmin ID.
-    Uses LOCAL date range + type + name matching.
+    Uses LOCAL date + type + name matching.
     
     Returns:
         - The existing Notion page if exactly 1 found
@@ -276,29 +452,9 @@ def activity_exists_by_date_fallback(client, database_id, activity_date_gmt, act
     
     lookup_type = "Stretching" if "stretch" in activity_name.lower() else main_type
     
-    start_iso, end_iso = get_local_date_range(activity_date_gmt)
-    
-    query = client.databases.query(
-        database_id=database_id,
-        filter={
-            "and": [
-                {"property": "Date", "date": {"on_or_after": start_iso}},
-                {"property": "Date", "date": {"before": end_iso}},
-                {"property": "Activity Type", "select": {"equals": lookup_type}},
-                {"property": "Activity Name", "title": {"equals": activity_name}}
-            ]
-        }
-    )
-    results = query.get('results', [])
+    start_iso, _ = get_local_date_range(activity_date_gmt)
     
-    if len(results) == 0:
-        return None
-    elif len(results) == 1:
-        return results[0]
-    else:
-        # Return collision with page IDs for debugging
-        page_ids = [r['id'] for r in results[:5]]  # First 5 for logging
-        return (MULTIPLE_MATCH, page_ids)
+    return _match_result(by_date_type_name.get((start_iso[:10], lookup_type, activity_name)))
 
 
 # ============================================================================
@@ -333,6 +489,17 @@ def safe_get_checkbox(props, key, default=False):
     return prop.get('checkbox', default)
 
 
+def safe_get_title(props, key, default=""):
+    """Safely get the plain text of a title property from Notion, with default."""
+    prop = props.get(key)
+    if prop is None:
+        return default
+    title = prop.get('title') or []
+    if not title:
+        return default
+    return "".join(t.get('plain_text') or t.get('text', {}).get('content', '') for t in title)
+
+
 def safe_get_rich_text(props, key, default=""):
     """Safely get rich_text content from Notion, with default."""
     prop = props.get(key)
@@ -346,204 +513,398 @@ def safe_get_rich_text(props, key, default=""):
     return text.get('content', default)
 
 
-def activity_needs_update(existing_activity, new_activity):
-    """Check if an existing activity needs to be updated."""
-    props = existing_activity['properties']
-    
-    activity_name = new_activity.get('activityName', '').lower()
+# Normalized fields covered by the Sync Hash, in a fixed order
+_HASH_FIELDS = (
+    'garmin_id', 'date_local', 'type', 'subtype', 'name',
+    'distance_km', 'duration_min', 'calories', 'pace', 'avg_power', 'max_power',
+    'training_effect', 'aerobic', 'aerobic_effect', 'anaerobic', 'anaerobic_effect',
+    'pr', 'fav',
+)
+
+
+# Tag of the Sync Hash values this script writes (see notion_common.read_sync_hash)
+SYNC_HASH_TAG = "activities-v1"
+
+
+def activity_content_hash(activity):
+    """
+    Short SHA-256 digest of a normalized activity's formatted fields.
+    Stored in the "Sync Hash" property so unchanged activities can be
+    detected with a single string compare.
+    """
+    fields = tuple(activity[key] for key in _HASH_FIELDS)
+    return hashlib.sha256(repr(fields).encode('utf-8')).hexdigest()[:16]
+
+
+def stored_sync_hash(page):
+    """Sync Hash this script wrote on a Notion page in a previous run, or ''."""
+    return read_sync_hash(page.get('properties', {}).get('Sync Hash'), SYNC_HASH_TAG)
+
+
+def normalize_activity(activity):
+    """
+    Format every field we sync exactly once.
+    The result is shared by the lookup, comparison and create/update paths.
+    """
+    garmin_id = activity.get('activityId')
+    activity_name = format_entertainment(activity.get('activityName', 'Unnamed Activity'))
     activity_type, activity_subtype = format_activity_type(
-        new_activity.get('activityType', {}).get('typeKey', 'Unknown'),
+        activity.get('activityType', {}).get('typeKey', 'Unknown'),
         activity_name
     )
+    activity_date_gmt = activity.get('startTimeGMT')
+    
+    normalized = {
+        'garmin_id': int(garmin_id) if garmin_id is not None else None,
+        'date_gmt': activity_date_gmt,
+        'date_local': convert_gmt_to_local(activity_date_gmt),
+        'type': activity_type,
+        'subtype': activity_subtype,
+        'name': activity_name,
+        'distance_km': round(activity.get('distance', 0) / 1000, 2),
+        'duration_min': round(activity.get('duration', 0) / 60, 2),
+        'calories': round(activity.get('calories', 0)),
+        'pace': format_pace(activity.get('averageSpeed', 0)),
+        'avg_power': round(activity.get('avgPower', 0), 1),
+        'max_power': round(activity.get('maxPower', 0), 1),
+        'training_effect': format_training_effect(activity.get('trainingEffectLabel', 'Unknown')),
+        'aerobic': round(activity.get('aerobicTrainingEffect', 0), 1),
+        'aerobic_effect': format_training_message(activity.get('aerobicTrainingEffectMessage', 'Unknown')),
+        'anaerobic': round(activity.get('anaerobicTrainingEffect', 0), 1),
+        'anaerobic_effect': format_training_message(activity.get('anaerobicTrainingEffectMessage', 'Unknown')),
+        'pr': activity.get('pr', False),
+        'fav': activity.get('favorite', False),
+        'icon_url': ACTIVITY_ICONS.get(activity_subtype if activity_subtype != activity_type else activity_type),
+    }
+    normalized['sync_hash'] = activity_content_hash(normalized)
+    return normalized
+
+
+# Column spec for activity_needs_update:
+# (normalized key, Notion property, reader, default, tolerance - None means exact)
+# Ordered cheapest and most likely to differ first; the first mismatch wins.
+_COMPARE_COLUMNS = (
+    ('pr', 'PR', safe_get_checkbox, False, None),
+    ('fav', 'Fav', safe_get_checkbox, False, None),
+    ('calories', 'Calories', safe_get_number, 0, None),
+    ('distance_km', 'Distance (km)', safe_get_number, 0, 0.01),
+    ('duration_min', 'Duration (min)', safe_get_number, 0, 0.01),
+    ('pace', 'Avg Pace', safe_get_rich_text, '', None),
+    ('avg_power', 'Avg Power', safe_get_number, 0, 0.1),
+    ('max_power', 'Max Power', safe_get_number, 0, 0.1),
+    ('training_effect', 'Training Effect', safe_get_select, 'Unknown', None),
+    ('aerobic', 'Aerobic', safe_get_number, 0, 0.1),
+    ('aerobic_effect', 'Aerobic Effect', safe_get_select, 'Unknown', None),
+    ('anaerobic', 'Anaerobic', safe_get_number, 0, 0.1),
+    ('anaerobic_effect', 'Anaerobic Effect', safe_get_select, 'Unknown', None),
+)
+
+
+def activity_needs_update(existing_activity, activity):
+    """Check if an existing activity needs to be updated (activity is normalized)."""
+    props = existing_activity['properties']
     
     # Check if Garmin ID is missing (needs backfill)
     garmin_id_missing = safe_get_number(props, 'Garmin ID', None) is None
     if garmin_id_missing:
         return True
     
-    # Compare all fields using safe accessors
-    new_distance = round(new_activity.get('distance', 0) / 1000, 2)
-    new_duration = round(new_activity.get('duration', 0) / 60, 2)
-    new_calories = round(new_activity.get('calories', 0))
-    new_pace = format_pace(new_activity.get('averageSpeed', 0))
-    new_avg_power = round(new_activity.get('avgPower', 0), 1)
-    new_max_power = round(new_activity.get('maxPower', 0), 1)
-    new_training_effect = format_training_effect(new_activity.get('trainingEffectLabel', 'Unknown'))
-    new_aerobic = round(new_activity.get('aerobicTrainingEffect', 0), 1)
-    new_aerobic_effect = format_training_message(new_activity.get('aerobicTrainingEffectMessage', 'Unknown'))
-    new_anaerobic = round(new_activity.get('anaerobicTrainingEffect', 0), 1)
-    new_anaerobic_effect = format_training_message(new_activity.get('anaerobicTrainingEffectMessage', 'Unknown'))
-    new_pr = new_activity.get('pr', False)
-    new_fav = new_activity.get('favorite', False)
-    
-    needs_update = (
-        not approx_equal(safe_get_number(props, 'Distance (km)', 0), new_distance, 0.01) or
-        not approx_equal(safe_get_number(props, 'Duration (min)', 0), new_duration, 0.01) or
-        safe_get_number(props, 'Calories', 0) != new_calories or
-        safe_get_rich_text(props, 'Avg Pace', '') != new_pace or
-        not approx_equal(safe_get_number(props, 'Avg Power', 0), new_avg_power, 0.1) or
-        not approx_equal(safe_get_number(props, 'Max Power', 0), new_max_power, 0.1) or
-        safe_get_select(props, 'Training Effect', 'Unknown') != new_training_effect or
-        not approx_equal(safe_get_number(props, 'Aerobic', 0), new_aerobic, 0.1) or
-        safe_get_select(props, 'Aerobic Effect', 'Unknown') != new_aerobic_effect or
-        not approx_equal(safe_get_number(props, 'Anaerobic', 0), new_anaerobic, 0.1) or
-        safe_get_select(props, 'Anaerobic Effect', 'Unknown') != new_anaerobic_effect or
-        safe_get_checkbox(props, 'PR', False) != new_pr or
-        safe_get_checkbox(props, 'Fav', False) != new_fav or
-        safe_get_select(props, 'Activity Type', '') != activity_type
-    )
+    activity_type = activity['type']
+    activity_subtype = activity['subtype']
+    
+    if safe_get_select(props, 'Activity Type', '') != activity_type:
+        return True
     
     # Check subactivity only if we have one to compare
     existing_subtype = safe_get_select(props, 'Subactivity Type', '')
     if existing_subtype:
-        needs_update = needs_update or (existing_subtype != activity_subtype)
+        if existing_subtype != activity_subtype:
+            return True
     elif activity_subtype and activity_subtype != activity_type:
         # Subactivity missing but we have one to add
-        needs_update = True
+        return True
+    
+    for key, prop, read, default, tolerance in _COMPARE_COLUMNS:
+        existing = read(props, prop, default)
+        if tolerance is None:
+            if existing != activity[key]:
+                return True
+        elif not approx_equal(existing, activity[key], tolerance):
+            return True
     
-    return needs_update
+    return False
 
 
 # ============================================================================
 # CREATE / UPDATE OPERATIONS
 # FIX #3: update_activity now also updates Date
+# Writes run concurrently (see main), so 429s are retried instead of dropped
+# (with_rate_limit_retry, shared with sync.py in notion_common.py)
 # ============================================================================
 
-def create_activity(client, database_id, activity):
-    """Create a new activity in Notion with Garmin ID."""
-    
-    garmin_id = activity.get('activityId')
-    activity_date_gmt = activity.get('startTimeGMT')
-    activity_name = format_entertainment(activity.get('activityName', 'Unnamed Activity'))
-    activity_type, activity_subtype = format_activity_type(
-        activity.get('activityType', {}).get('typeKey', 'Unknown'),
-        activity_name
-    )
+def _num(value):
+    return {"number": value}
+
+
+def _sel(name):
+    return {"select": {"name": name}}
+
+
+def _rt(text):
+    return {"rich_text": [{"text": {"content": text}}]}
+
+
+def _chk(value):
+    return {"checkbox": bool(value)}
+
+
+def _date(start):
+    return {"date": {"start": start}}
+
+
+def _title(text):
+    return {"title": [{"text": {"content": text}}]}
+
+
+# (Notion property, normalized key, builder) for every plain-mapped field
+_ACTIVITY_FIELDS = (
+    ("Date", 'date_local', _date),
+    ("Distance (km)", 'distance_km', _num),
+    ("Duration (min)", 'duration_min', _num),
+    ("Calories", 'calories', _num),
+    ("Avg Pace", 'pace', _rt),
+    ("Avg Power", 'avg_power', _num),
+    ("Max Power", 'max_power', _num),
+    ("Training Effect", 'training_effect', _sel),
+    ("Aerobic", 'aerobic', _num),
+    ("Aerobic Effect", 'aerobic_effect', _sel),
+    ("Anaerobic", 'anaerobic', _num),
+    ("Anaerobic Effect", 'anaerobic_effect', _sel),
+    ("PR", 'pr', _chk),
+    ("Fav", 'fav', _chk),
+)
+
+# Select properties and the normalized key each one is built from
+_SELECT_KEYS = {label: key for label, key, build in _ACTIVITY_FIELDS if build is _sel}
+_SELECT_KEYS.update({"Activity Type": 'type', "Subactivity Type": 'subtype'})
+
+
+def build_properties(activity, act_type, act_subtype, include_name=True, sync_column=False):
+    """
+    Notion properties for a normalized activity.
+    "Sync Hash" is only included when the database has that column.
+    """
+    props = {label: build(activity[key]) for label, key, build in _ACTIVITY_FIELDS}
+    props["Activity Type"] = _sel(act_type)
+    props["Subactivity Type"] = _sel(act_subtype)
+    if include_name:
+        props["Activity Name"] = _title(activity['name'])
+    if activity['garmin_id'] is not None:
+        props["Garmin ID"] = _num(activity['garmin_id'])
+    if sync_column:
+        props["Sync Hash"] = _rt(tag_sync_hash(SYNC_HASH_TAG, activity['sync_hash']))
+    return props
+
+
+def written_sync_hash(activity, properties, sync_column):
+    """
+    Sync Hash of what a fallback write actually stores: the activity with the
+    select options sent in properties (e.g. "Unknown") instead of its own.
+    Updates properties["Sync Hash"] to match when the column exists.
+    """
+    written = dict(activity)
+    for name, key in _SELECT_KEYS.items():
+        if name in properties:
+            written[key] = property_value(properties[name])
+    sync_hash = activity_content_hash(written)
+    if sync_column:
+        properties["Sync Hash"] = _rt(tag_sync_hash(SYNC_HASH_TAG, sync_hash))
+    return sync_hash
+
+
+def create_activity(client, database_id, activity, sync_column=False):
+    """
+    Create a new activity in Notion with Garmin ID (activity is normalized).
+    Returns (created page, Sync Hash written) - page is None in DRY_RUN -
+    or None on error.
+    """
     
-    activity_date_local = convert_gmt_to_local(activity_date_gmt)
-    icon_url = ACTIVITY_ICONS.get(activity_subtype if activity_subtype != activity_type else activity_type)
+    garmin_id = activity['garmin_id']
+    activity_name = activity['name']
+    icon_url = activity['icon_url']
     
     # DRY_RUN: preview without writing
     if DRY_RUN:
-        return True  # Signal success for counting
-    
-    def build_properties(act_type, act_subtype):
-        props = {
-            "Date": {"date": {"start": activity_date_local}},
-            "Activity Type": {"select": {"name": act_type}},
-            "Subactivity Type": {"select": {"name": act_subtype}},
-            "Activity Name": {"title": [{"text": {"content": activity_name}}]},
-            "Distance (km)": {"number": round(activity.get('distance', 0) / 1000, 2)},
-            "Duration (min)": {"number": round(activity.get('duration', 0) / 60, 2)},
-            "Calories": {"number": round(activity.get('calories', 0))},
-            "Avg Pace": {"rich_text": [{"text": {"content": format_pace(activity.get('averageSpeed', 0))}}]},
-            "Avg Power": {"number": round(activity.get('avgPower', 0), 1)},
-            "Max Power": {"number": round(activity.get('maxPower', 0), 1)},
-            "Training Effect": {"select": {"name": format_training_effect(activity.get('trainingEffectLabel', 'Unknown'))}},
-            "Aerobic": {"number": round(activity.get('aerobicTrainingEffect', 0), 1)},
-            "Aerobic Effect": {"select": {"name": format_training_message(activity.get('aerobicTrainingEffectMessage', 'Unknown'))}},
-            "Anaerobic": {"number": round(activity.get('anaerobicTrainingEffect', 0), 1)},
-            "Anaerobic Effect": {"select": {"name": format_training_message(activity.get('anaerobicTrainingEffectMessage', 'Unknown'))}},
-            "PR": {"checkbox": activity.get('pr', False)},
-            "Fav": {"checkbox": activity.get('favorite', False)}
-        }
-        if garmin_id is not None:
-            props["Garmin ID"] = {"number": int(garmin_id)}
-        return props
+        return None, activity['sync_hash']  # Signal success for counting
     
     page = {
         "parent": {"database_id": database_id},
-        "properties": build_properties(activity_type, activity_subtype),
+        "properties": build_properties(activity, activity['type'], activity['subtype'], sync_column=sync_column),
     }
     
     if icon_url:
         page["icon"] = {"type": "external", "external": {"url": icon_url}}
     
     try:
-        client.pages.create(**page)
-        return True
+        return with_rate_limit_retry(client.pages.create, NOTION_CREATE_RETRY_STATUSES, **page), activity['sync_hash']
     except Exception as e:
         error_msg = str(e).lower()
-        # If select option doesn't exist, retry with "Unknown" fallback
+        # If select option doesn't exist, retry with "Unknown" fallback (icon kept)
         if any(x in error_msg for x in ["select", "is not a valid", "does not exist", "validation_error"]):
             print(f"⚠️ Unknown select option for {activity_name}, falling back to 'Unknown'")
-            page["properties"] = build_properties("Unknown", "Unknown")
+            page["properties"] = build_properties(activity, "Unknown", "Unknown")
+            sync_hash = written_sync_hash(activity, page["properties"], sync_column)
             try:
-                client.pages.create(**page)
-                return True
+                return with_rate_limit_retry(client.pages.create, NOTION_CREATE_RETRY_STATUSES, **page), sync_hash
             except Exception as e2:
                 print(f"ERROR creating {activity_name} (Garmin ID: {garmin_id}): {e2}")
-                return False
+                return None
         print(f"ERROR creating {activity_name} (Garmin ID: {garmin_id}): {e}")
-        return False
+        return None
 
 
-def update_activity(client, existing_activity, new_activity):
-    """Update an existing activity (including Garmin ID backfill and Date alignment)."""
-    
-    garmin_id = new_activity.get('activityId')
-    activity_date_gmt = new_activity.get('startTimeGMT')
-    activity_name = format_entertainment(new_activity.get("activityName"))
-    activity_type, activity_subtype = format_activity_type(
-        new_activity.get('activityType', {}).get('typeKey', 'Unknown'),
-        activity_name
-    )
+def _unknown_select_fallback(properties, error_msg):
+    """
+    Replace the select option(s) named in a Notion validation error with "Unknown".
+    Falls back to Activity Type/Subactivity Type when no property is named.
+    """
+    offending = [name for name, prop in properties.items() if 'select' in prop and name.lower() in error_msg]
+    for name in offending or [n for n in ("Activity Type", "Subactivity Type") if n in properties]:
+        properties[name] = _sel("Unknown")
+    return properties
+
+
+def update_activity(client, existing_activity, activity, sync_column=False):
+    """
+    Update an existing activity (including Garmin ID backfill and Date alignment).
+    Only properties that differ from the existing page are sent.
+    Returns the Sync Hash of what the page now holds, or None on error.
+    """
     
-    activity_date_local = convert_gmt_to_local(activity_date_gmt)
-    icon_url = ACTIVITY_ICONS.get(activity_subtype if activity_subtype != activity_type else activity_type)
+    garmin_id = activity['garmin_id']
+    activity_name = activity['name']
+    icon_url = activity['icon_url']
     
     # DRY_RUN: preview without writing
     if DRY_RUN:
-        return True  # Signal success for counting
-    
-    def build_properties(act_type, act_subtype):
-        props = {
-            "Date": {"date": {"start": activity_date_local}},
-            "Activity Type": {"select": {"name": act_type}},
-            "Subactivity Type": {"select": {"name": act_subtype}},
-            "Distance (km)": {"number": round(new_activity.get('distance', 0) / 1000, 2)},
-            "Duration (min)": {"number": round(new_activity.get('duration', 0) / 60, 2)},
-            "Calories": {"number": round(new_activity.get('calories', 0))},
-            "Avg Pace": {"rich_text": [{"text": {"content": format_pace(new_activity.get('averageSpeed', 0))}}]},
-            "Avg Power": {"number": round(new_activity.get('avgPower', 0), 1)},
-            "Max Power": {"number": round(new_activity.get('maxPower', 0), 1)},
-            "Training Effect": {"select": {"name": format_training_effect(new_activity.get('trainingEffectLabel', 'Unknown'))}},
-            "Aerobic": {"number": round(new_activity.get('aerobicTrainingEffect', 0), 1)},
-            "Aerobic Effect": {"select": {"name": format_training_message(new_activity.get('aerobicTrainingEffectMessage', 'Unknown'))}},
-            "Anaerobic": {"number": round(new_activity.get('anaerobicTrainingEffect', 0), 1)},
-            "Anaerobic Effect": {"select": {"name": format_training_message(new_activity.get('anaerobicTrainingEffectMessage', 'Unknown'))}},
-            "PR": {"checkbox": new_activity.get('pr', False)},
-            "Fav": {"checkbox": new_activity.get('favorite', False)}
-        }
-        if garmin_id is not None:
-            props["Garmin ID"] = {"number": int(garmin_id)}
-        return props
+        return activity['sync_hash']  # Signal success for counting
     
+    new_props = build_properties(
+        activity, activity['type'], activity['subtype'], include_name=False, sync_column=sync_column
+    )
     update = {
         "page_id": existing_activity['id'],
-        "properties": build_properties(activity_type, activity_subtype),
+        "properties": diff_properties(new_props, existing_activity),
     }
     
-    if icon_url:
+    existing_icon = (existing_activity.get('icon') or {}).get('external', {}).get('url')
+    if icon_url and icon_url != existing_icon:
         update["icon"] = {"type": "external", "external": {"url": icon_url}}
     
+    if not update["properties"] and "icon" not in update:
+        return activity['sync_hash']  # Already in sync, nothing to send
+    
     try:
-        client.pages.update(**update)
-        return True
+        with_rate_limit_retry(client.pages.update, **update)
+        return activity['sync_hash']
     except Exception as e:
         error_msg = str(e).lower()
-        # If select option doesn't exist, retry with "Unknown" fallback
+        # If select option doesn't exist, retry with "Unknown" for that select only
         if any(x in error_msg for x in ["select", "is not a valid", "does not exist", "validation_error"]):
             print(f"⚠️ Unknown select option for {activity_name}, falling back to 'Unknown'")
-            update["properties"] = build_properties("Unknown", "Unknown")
+            update["properties"] = _unknown_select_fallback(dict(update["properties"]), error_msg)
+            sync_hash = written_sync_hash(activity, update["properties"], sync_column)
             try:
-                client.pages.update(**update)
-                return True
+                with_rate_limit_retry(client.pages.update, **update)
+                return sync_hash
             except Exception as e2:
                 print(f"ERROR updating {activity_name} (Garmin ID: {garmin_id}): {e2}")
-                return False
+                return None
         print(f"ERROR updating {activity_name} (Garmin ID: {garmin_id}): {e}")
-        return False
+        return None
+
+
+# ============================================================================
+# LOCAL SYNC STATE - remembers what was written so unchanged activities
+# need no Notion traffic at all on the next run
+# ============================================================================
+
+# Bump when the cache layout or hash inputs change; older files are discarded
+SYNC_STATE_VERSION = "1"
+
+# Next to sync.py's index, so it does not depend on the working directory
+DEFAULT_SYNC_STATE_DB = "~/.cache/garmin-to-notion/sync_state.db"
+
+
+def open_sync_state(path):
+    """Open (and create if needed) the SQLite sync-state cache."""
+    path = Path(path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS synced ("
+        "gid INTEGER PRIMARY KEY, hash TEXT, page_id TEXT, ts TEXT)"
+    )
+    conn.execute("CREATE TABLE IF NOT EXISTS notion_ids (gid INTEGER PRIMARY KEY)")
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+    if row is None or row[0] != SYNC_STATE_VERSION:
+        clear_sync_state(conn)
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)", (SYNC_STATE_VERSION,))
+        conn.commit()
+    return conn
+
+
+def clear_sync_state(conn):
+    """Forget every cached activity and the Notion ID index."""
+    conn.execute("DELETE FROM synced")
+    conn.execute("DELETE FROM notion_ids")
+    conn.execute("DELETE FROM meta WHERE key IN ('index_seeded', 'synced_through')")
+
+
+def load_sync_state(conn):
+    """Return {garmin_id: (sync_hash, page_id)} for every cached activity."""
+    return {gid: (sync_hash, page_id) for gid, sync_hash, page_id in conn.execute(
+        "SELECT gid, hash, page_id FROM synced"
+    )}
+
+
+def record_synced(conn, rows):
+    """Upsert (garmin_id, sync_hash, page_id) rows into the cache."""
+    ts = datetime.now(timezone.utc).isoformat()
+    conn.executemany(
+        "INSERT OR REPLACE INTO synced (gid, hash, page_id, ts) VALUES (?, ?, ?, ?)",
+        [(gid, sync_hash, page_id, ts) for gid, sync_hash, page_id in rows]
+    )
+    conn.commit()
+
+
+def get_meta(conn, key):
+    """Return a value from the cache's meta table, or None."""
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def set_meta(conn, key, value):
+    """Store a value in the cache's meta table."""
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+    conn.commit()
+
+
+def load_notion_ids(conn):
+    """
+    Return (seeded, garmin_ids): whether a full Notion scan has been recorded,
+    and every Garmin ID known to exist in Notion as of that scan.
+    """
+    seeded = conn.execute("SELECT 1 FROM meta WHERE key = 'index_seeded'").fetchone() is not None
+    return seeded, {gid for (gid,) in conn.execute("SELECT gid FROM notion_ids")}
+
+
+def record_notion_ids(conn, garmin_ids):
+    """Add Garmin IDs seen in Notion and mark the ID index as seeded."""
+    conn.executemany("INSERT OR IGNORE INTO notion_ids (gid) VALUES (?)", [(gid,) for gid in garmin_ids])
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('index_seeded', '1')")
+    conn.commit()
 
 
 # ============================================================================
@@ -552,6 +913,7 @@ def update_activity(client, existing_activity, new_activity):
 
 def main():
     global DRY_RUN
+    from dotenv import load_dotenv
     load_dotenv()
     
     # DRY_RUN mode: set DRY_RUN=true in environment to test without writing
@@ -563,6 +925,10 @@ def main():
     if missing:
         raise RuntimeError(f"Missing required environment variables: {', '.join(missing)}")
 
+    # Third-party clients are only imported once we know we will use them
+    from garminconnect import Garmin
+    from notion_client import Client
+
     garmin_email = os.getenv("GARMIN_EMAIL")
     garmin_password = os.getenv("GARMIN_PASSWORD")
     notion_token = os.getenv("NOTION_TOKEN")
@@ -571,8 +937,29 @@ def main():
     garmin = Garmin(garmin_email, garmin_password)
     garmin.login()
     client = Client(auth=notion_token)
+    sync_column = has_sync_hash_column(client, database_id)
+    if not sync_column:
+        print("No 'Sync Hash' column in the Activities database; relying on the local sync state")
+    
+    # Local cache of what was already written (see open_sync_state)
+    state_conn = open_sync_state(os.getenv("SYNC_STATE_DB", DEFAULT_SYNC_STATE_DB))
+    if "--rebuild-cache" in sys.argv[1:]:
+        print("Rebuilding sync-state cache from Notion")
+        clear_sync_state(state_conn)
+    sync_state = load_sync_state(state_conn)
+    index_seeded, notion_ids = load_notion_ids(state_conn)
     
-    activities = get_all_activities(garmin)
+    # Incremental by default: only the delta since the last run (one day of
+    # overlap), or FIRST_RUN_DAYS when nothing was synced yet. --full pages
+    # through the whole history, e.g. to pick up edits to old activities.
+    synced_through = get_meta(state_conn, 'synced_through')
+    if "--full" in sys.argv[1:]:
+        activities = get_all_activities(garmin)
+    elif synced_through:
+        activities = get_activities_since(garmin, date.fromisoformat(synced_through) - timedelta(days=1))
+    else:
+        activities = get_activities_since(garmin, datetime.now(local_tz).date() - timedelta(days=FIRST_RUN_DAYS))
+    print(f"Fetched {len(activities)} activities from Garmin")
     
     # Counters for logging
     created_count = 0
@@ -582,20 +969,67 @@ def main():
     error_count = 0
     found_by_id = 0
     found_by_fallback = 0
+    found_in_cache = 0
+    
+    # (lookup_method or None for creates, activity, existing page or None)
+    pending_writes = []
+    # (garmin_id, sync_hash, page_id) rows confirmed in sync with Notion
+    synced_rows = []
+    # Local dates of failed writes, so the next incremental run covers them
+    failed_dates = []
     
     if DRY_RUN:
         print("=" * 50)
         print("DRY_RUN MODE - No changes will be made")
         print("=" * 50)
+    
+    # Activities already in the cache need no Notion reads: skip them if
+    # unchanged, otherwise update the cached page directly. Once a full scan
+    # has been recorded, an ID absent from both cache and index is probably
+    # new, but sync.py and hand edits write to the same database: such IDs
+    # get a targeted query (to_probe) instead of the full scan.
+    to_lookup = []
+    to_probe = []
+    latest_date = synced_through or ''
+    for raw_activity in activities:
+        activity = normalize_activity(raw_activity)
+        latest_date = max(latest_date, (activity['date_local'] or '')[:10])
+        cached = sync_state.get(activity['garmin_id'])
+        if cached is None:
+            if index_seeded and activity['garmin_id'] is not None and activity['garmin_id'] not in notion_ids:
+                to_probe.append(activity)
+            else:
+                to_lookup.append(activity)
+            continue
+        found_in_cache += 1
+        cached_hash, cached_page_id = cached
+        if cached_hash == activity['sync_hash']:
+            unchanged_count += 1
+        else:
+            pending_writes.append(("CACHE", activity, {'id': cached_page_id}))
+    
+    # Only scan Notion when some activity is unknown to the cache
+    by_garmin_id, by_date_type_name = {}, {}
+    scanned_notion = False
+    if to_lookup:
+        by_garmin_id, by_date_type_name = load_all_notion_activities(client, database_id)
+        scanned_notion = True
+    elif to_probe:
+        by_garmin_id, by_date_type_name = probe_notion_activities(client, database_id, to_probe)
+    to_lookup += to_probe
+    if to_lookup:
+        notion_ids.update(by_garmin_id)
+        for garmin_id, pages in by_garmin_id.items():
+            # Only hashes this script wrote; sync.py's cover different inputs
+            stored_hash = stored_sync_hash(pages[0])
+            if len(pages) == 1 and stored_hash:
+                synced_rows.append((garmin_id, stored_hash, pages[0]['id']))
 
-    for activity in activities:
-        garmin_id = activity.get('activityId')
-        activity_date_gmt = activity.get('startTimeGMT')
-        activity_name = format_entertainment(activity.get('activityName', 'Unnamed Activity'))
-        activity_type, activity_subtype = format_activity_type(
-            activity.get('activityType', {}).get('typeKey', 'Unknown'),
-            activity_name
-        )
+    for activity in to_lookup:
+        garmin_id = activity['garmin_id']
+        activity_date_gmt = activity['date_gmt']
+        activity_name = activity['name']
+        activity_type = activity['type']
         
         # =====================================================================
         # DEDUPLICATION STRATEGY:
@@ -604,7 +1038,7 @@ def main():
         # 3. COLLISION GUARD: Skip if multiple matches found
         # =====================================================================
         
-        existing_activity = activity_exists_by_garmin_id(client, database_id, garmin_id)
+        existing_activity = activity_exists_by_garmin_id(by_garmin_id, garmin_id)
         lookup_method = "ID"
         
         # Check for collision (returns tuple with page IDs)
@@ -620,7 +1054,7 @@ def main():
         else:
             # Fallback for old activities that don't have Garmin ID yet
             existing_activity = activity_exists_by_date_fallback(
-                client, database_id, activity_date_gmt, activity_type, activity_name
+                by_date_type_name, activity_date_gmt, activity_type, activity_name
             )
             lookup_method = "FALLBACK"
             
@@ -636,28 +1070,69 @@ def main():
                 found_by_fallback += 1
         
         if existing_activity:
-            if activity_needs_update(existing_activity, activity):
-                success = update_activity(client, existing_activity, activity)
-                if success:
-                    updated_count += 1
-                    if DRY_RUN:
-                        print(f"WOULD_UPDATE ({lookup_method}): {activity_name} (Garmin ID: {garmin_id})")
-                    else:
-                        print(f"UPDATED ({lookup_method}): {activity_name} (Garmin ID: {garmin_id})")
-                else:
-                    error_count += 1
+            # Matching Sync Hash means nothing changed since the last write
+            if stored_sync_hash(existing_activity) == activity['sync_hash']:
+                unchanged_count += 1
+            elif activity_needs_update(existing_activity, activity):
+                pending_writes.append((lookup_method, activity, existing_activity))
             else:
                 unchanged_count += 1
+                if garmin_id is not None:
+                    synced_rows.append((garmin_id, activity['sync_hash'], existing_activity['id']))
         else:
-            success = create_activity(client, database_id, activity)
-            if success:
+            pending_writes.append((None, activity, None))
+    
+    # Dispatch creates/updates concurrently; counters stay on the main thread
+    with ThreadPoolExecutor(max_workers=NOTION_WRITE_WORKERS) as executor:
+        futures = {}
+        for lookup_method, activity, existing_activity in pending_writes:
+            if existing_activity:
+                future = executor.submit(update_activity, client, existing_activity, activity, sync_column)
+            else:
+                future = executor.submit(create_activity, client, database_id, activity, sync_column)
+            futures[future] = (lookup_method, activity, existing_activity)
+        
+        for future in as_completed(futures):
+            lookup_method, activity, existing_activity = futures[future]
+            activity_name = activity['name']
+            garmin_id = activity['garmin_id']
+            result = future.result()
+            if result is None:
+                error_count += 1
+                if activity['date_local']:
+                    failed_dates.append(activity['date_local'][:10])
+                continue
+            
+            if existing_activity:
+                page_id, written_hash = existing_activity['id'], result
+            else:
+                page, written_hash = result
+                page_id = page.get('id') if isinstance(page, dict) else None
+            if garmin_id is not None and page_id:
+                synced_rows.append((garmin_id, written_hash, page_id))
+            
+            if lookup_method:
+                updated_count += 1
+                if DRY_RUN:
+                    print(f"WOULD_UPDATE ({lookup_method}): {activity_name} (Garmin ID: {garmin_id})")
+                else:
+                    print(f"UPDATED ({lookup_method}): {activity_name} (Garmin ID: {garmin_id})")
+            else:
                 created_count += 1
                 if DRY_RUN:
                     print(f"WOULD_CREATE: {activity_name} (Garmin ID: {garmin_id})")
                 else:
                     print(f"CREATED: {activity_name} (Garmin ID: {garmin_id})")
-            else:
-                error_count += 1
+    
+    if not DRY_RUN:
+        record_synced(state_conn, synced_rows)
+        if scanned_notion or index_seeded:
+            record_notion_ids(state_conn, notion_ids | {gid for gid, _, _ in synced_rows})
+        if failed_dates:
+            latest_date = min(latest_date, min(failed_dates))
+        if latest_date:
+            set_meta(state_conn, 'synced_through', latest_date)
+    state_conn.close()
     
     # Summary
     print(f"\n{'=' * 50}")
@@ -668,6 +1143,7 @@ def main():
     print(f"Unchanged: {unchanged_count}")
     print(f"Found by ID: {found_by_id}")
     print(f"Found by fallback: {found_by_fallback}")
+    print(f"Found in local cache: {found_in_cache}")
     print(f"Skipped (collision): {skipped_collision}")
     print(f"Errors: {error_count}")
 
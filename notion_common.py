@@ -0,0 +1,130 @@
+"""
+Notion helpers shared by sync.py and garmin-activities.py: request pacing
+and retries, diffing built properties against an existing page, and the
+"Sync Hash" value format.
+
+Standard library only, so the scripts can import it before their
+third-party clients.
+"""
+
+import random
+import threading
+import time
+from datetime import datetime
+
+# Notion averages ~3 requests/second per integration
+NOTION_REQUESTS_PER_SECOND = 3
+NOTION_MAX_RETRIES = 5
+# Rate limited, or Notion's documented transient server errors: retried for
+# reads and updates. A 502/504 can come back after a new page was saved, so
+# creates only retry responses that mean it was not processed.
+NOTION_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+NOTION_CREATE_RETRY_STATUSES = frozenset({429, 503})
+
+
+class RateLimiter:
+    """Thread-safe token bucket: at most `rate` calls per second, bursts of `rate`."""
+    
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until it is available."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Reserve the token now; a negative balance is the queue ahead of us
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+# Shared by all Notion requests of a process so together they stay at Notion's sustained rate
+notion_rate_limiter = RateLimiter(NOTION_REQUESTS_PER_SECOND)
+
+
+def _retry_after_seconds(retry_after, default):
+    """Seconds to wait for a Retry-After value; default if missing or not a number (e.g. an HTTP-date)."""
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        return default
+
+
+def with_rate_limit_retry(fn, retry_statuses=NOTION_RETRY_STATUSES, **kwargs):
+    """
+    Call a Notion API method under the rate limiter, retrying responses in
+    retry_statuses (NOTION_CREATE_RETRY_STATUSES for pages.create). Waits
+    Retry-After if given, else 1, 2, 4, 8 s, plus up to 50% jitter so
+    parallel workers do not retry in lockstep.
+    """
+    for attempt in range(NOTION_MAX_RETRIES):
+        notion_rate_limiter.acquire()
+        try:
+            return fn(**kwargs)
+        except Exception as e:
+            # notion_client.APIResponseError carries the HTTP status
+            if getattr(e, 'status', None) not in retry_statuses or attempt == NOTION_MAX_RETRIES - 1:
+                raise
+            headers = getattr(e, 'headers', None)
+            delay = _retry_after_seconds(headers.get('Retry-After') if headers else None, 2 ** attempt)
+            time.sleep(delay + random.uniform(0, delay / 2))
+
+
+def property_value(prop):
+    """Comparable value of a Notion property, whether read from a page or built by us."""
+    if prop is None:
+        return None
+    if 'number' in prop:
+        return prop['number']
+    if 'checkbox' in prop:
+        return prop['checkbox']
+    if 'select' in prop:
+        return (prop['select'] or {}).get('name')
+    for text_key in ('rich_text', 'title'):
+        if text_key in prop:
+            return "".join(t.get('plain_text') or (t.get('text') or {}).get('content', '') for t in prop[text_key] or [])
+    if 'date' in prop:
+        start = (prop['date'] or {}).get('start')
+        try:
+            # Notion echoes "...T19:37:00.000+01:00" for our "...T19:37:00+01:00"
+            return datetime.fromisoformat(start.replace('Z', '+00:00'))
+        except (AttributeError, ValueError):
+            return start
+    return prop
+
+
+def property_differs(new_prop, existing_prop):
+    """Whether a property we built holds a different value than the page's."""
+    new_value = property_value(new_prop)
+    old_value = property_value(existing_prop)
+    if isinstance(new_value, float) and isinstance(old_value, (int, float)):
+        return abs(old_value - new_value) > 1e-6
+    return new_value != old_value
+
+
+def diff_properties(new_props, existing_page):
+    """Only the entries of new_props whose value differs from the existing page."""
+    existing_props = existing_page.get('properties') or {}
+    return {name: prop for name, prop in new_props.items() if property_differs(prop, existing_props.get(name))}
+
+
+# "Sync Hash" values are stored as "<tag>:<hash>". sync.py and
+# garmin-activities.py hash different inputs into the same column, so each
+# script reads back only values carrying its own tag.
+
+
+def tag_sync_hash(tag, digest):
+    """Value to store in the Sync Hash property for a digest."""
+    return f"{tag}:{digest}"
+
+
+def read_sync_hash(prop, tag):
+    """Digest stored in a Sync Hash property under tag, or '' (untagged or another tag)."""
+    stored_tag, _, digest = (property_value(prop) or "").partition(":")
+    return digest if stored_tag == tag else ""
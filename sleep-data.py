@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from garminconnect import Garmin
 from notion_client import Client
@@ -12,6 +13,17 @@ DATABASE_ID = os.environ.get("NOTION_SLEEP_DB_ID")
 # Number of days to fetch (adjust as needed - 730 = ~2 years)
 DAYS_TO_FETCH = 730
 
+# Stop walking back once this many consecutive days are already synced
+# (only past RESYNC_WINDOW_DAYS, so recent gaps are always re-checked)
+EARLY_EXIT_RUN = int(os.environ.get("SLEEP_EARLY_EXIT_RUN", "14"))
+RESYNC_WINDOW_DAYS = 30
+
+# Parallel Garmin requests (Notion writes stay on the main thread)
+MAX_WORKERS = 8
+
+# Sleep goal: 7 hours
+SLEEP_GOAL_SECONDS = 25200
+
 
 def format_duration(seconds):
     """Convert seconds to human-readable format (Xh Xm)."""
@@ -43,12 +55,66 @@ def sleep_exists(client, database_id, sleep_date):
     return len(query["results"]) > 0
 
 
-def write_to_notion(client, database_id, sleep_data, sleep_date):
-    """Write sleep data to Notion database."""
-    
-    # Extract sleep values safely
-    daily_sleep = sleep_data.get("dailySleepDTO", {})
-    
+def fetch_existing_sleep_dates(client, database_id, since_date):
+    """Return the set of ISO dates on or after since_date already in the sleep database.
+
+    One paginated range query (100 rows per request) replaces a
+    sleep_exists() call per day.
+    """
+    existing_dates = set()
+    query_args = {
+        "database_id": database_id,
+        "page_size": 100,
+        "filter": {
+            "property": "Long Date",
+            "date": {
+                "on_or_after": since_date.isoformat()
+            }
+        }
+    }
+    while True:
+        query = client.databases.query(**query_args)
+        for page in query["results"]:
+            date_prop = page["properties"].get("Long Date", {}).get("date")
+            if date_prop and date_prop.get("start"):
+                existing_dates.add(date_prop["start"][:10])
+        if not query.get("has_more"):
+            break
+        query_args["start_cursor"] = query.get("next_cursor")
+    return existing_dates
+
+
+def _text(content):
+    return {"rich_text": [{"text": {"content": content}}]}
+
+
+# (Notion property, builder taking the summary from summarize_sleep)
+_SLEEP_PROP_BUILDERS = (
+    ("Date", lambda s: {"title": [{"text": {"content": s["date"]}}]}),
+    ("Long Date", lambda s: {"date": {"start": s["date"]}}),
+    ("Times", lambda s: _text(s["times"])),
+    ("Total Sleep", lambda s: _text(format_duration(s["total"]))),
+    ("Total Sleep (h)", lambda s: {"number": seconds_to_hours(s["total"])}),
+    ("Deep Sleep", lambda s: _text(format_duration(s["deep"]))),
+    ("Deep Sleep (h)", lambda s: {"number": seconds_to_hours(s["deep"])}),
+    ("Light Sleep", lambda s: _text(format_duration(s["light"]))),
+    ("Light Sleep (h)", lambda s: {"number": seconds_to_hours(s["light"])}),
+    ("REM Sleep", lambda s: _text(format_duration(s["rem"]))),
+    ("REM Sleep (h)", lambda s: {"number": seconds_to_hours(s["rem"])}),
+    ("Awake Time", lambda s: _text(format_duration(s["awake"]))),
+    ("Awake Time (h)", lambda s: {"number": seconds_to_hours(s["awake"])}),
+    ("Resting HR", lambda s: {"number": s["resting_hr"]}),
+    ("Sleep Goal", lambda s: {"checkbox": s["total"] >= SLEEP_GOAL_SECONDS}),
+)
+
+
+def sleep_field(daily_sleep, key):
+    """Value of a dailySleepDTO field, with missing or null treated as 0."""
+    return daily_sleep.get(key) or 0
+
+
+def summarize_sleep(daily_sleep, sleep_date):
+    """Extract the values the sleep properties are built from, once per day."""
     sleep_start = daily_sleep.get("sleepStartTimestampLocal")
     sleep_end = daily_sleep.get("sleepEndTimestampLocal")
     
@@ -62,70 +128,28 @@ def write_to_notion(client, database_id, sleep_data, sleep_date):
         except:
             times_str = ""
     
-    # Get sleep stages (in seconds)
-    deep_sleep_seconds = daily_sleep.get("deepSleepSeconds", 0) or 0
-    light_sleep_seconds = daily_sleep.get("lightSleepSeconds", 0) or 0
-    rem_sleep_seconds = daily_sleep.get("remSleepSeconds", 0) or 0
-    awake_seconds = daily_sleep.get("awakeSleepSeconds", 0) or 0
-    
-    # Total sleep
-    total_sleep_seconds = deep_sleep_seconds + light_sleep_seconds + rem_sleep_seconds
-    
-    # Resting heart rate
-    resting_hr = daily_sleep.get("restingHeartRate", 0) or 0
-    
-    # Sleep goal (assume 8 hours = 28800 seconds)
-    sleep_goal_met = total_sleep_seconds >= 25200  # 7 hours
+    # Sleep stages (in seconds)
+    deep = sleep_field(daily_sleep, "deepSleepSeconds")
+    light = sleep_field(daily_sleep, "lightSleepSeconds")
+    rem = sleep_field(daily_sleep, "remSleepSeconds")
     
+    return {
+        "date": sleep_date,
+        "times": times_str,
+        "deep": deep,
+        "light": light,
+        "rem": rem,
+        "awake": sleep_field(daily_sleep, "awakeSleepSeconds"),
+        "total": deep + light + rem,
+        "resting_hr": sleep_field(daily_sleep, "restingHeartRate"),
+    }
+
+
+def write_to_notion(client, database_id, summary):
+    """Write one day's summarize_sleep summary to the Notion database."""
     client.pages.create(
         parent={"database_id": database_id},
-        properties={
-            "Date": {
-                "title": [{"text": {"content": sleep_date}}]
-            },
-            "Long Date": {
-                "date": {"start": sleep_date}
-            },
-            "Times": {
-                "rich_text": [{"text": {"content": times_str}}]
-            },
-            "Total Sleep": {
-                "rich_text": [{"text": {"content": format_duration(total_sleep_seconds)}}]
-            },
-            "Total Sleep (h)": {
-                "number": seconds_to_hours(total_sleep_seconds)
-            },
-            "Deep Sleep": {
-                "rich_text": [{"text": {"content": format_duration(deep_sleep_seconds)}}]
-            },
-            "Deep Sleep (h)": {
-                "number": seconds_to_hours(deep_sleep_seconds)
-            },
-            "Light Sleep": {
-                "rich_text": [{"text": {"content": format_duration(light_sleep_seconds)}}]
-            },
-            "Light Sleep (h)": {
-                "number": seconds_to_hours(light_sleep_seconds)
-            },
-            "REM Sleep": {
-                "rich_text": [{"text": {"content": format_duration(rem_sleep_seconds)}}]
-            },
-            "REM Sleep (h)": {
-                "number": seconds_to_hours(rem_sleep_seconds)
-            },
-            "Awake Time": {
-                "rich_text": [{"text": {"content": format_duration(awake_seconds)}}]
-            },
-            "Awake Time (h)": {
-                "number": seconds_to_hours(awake_seconds)
-            },
-            "Resting HR": {
-                "number": resting_hr
-            },
-            "Sleep Goal": {
-                "checkbox": sleep_goal_met
-            }
-        }
+        properties={name: build(summary) for name, build in _SLEEP_PROP_BUILDERS}
     )
 
 
@@ -147,40 +171,66 @@ def main():
     skipped_count = 0
     error_count = 0
     
+    # Load existing dates once; fall back to per-day checks if that fails
+    try:
+        existing_dates = fetch_existing_sleep_dates(
+            notion, DATABASE_ID, today - timedelta(days=DAYS_TO_FETCH - 1)
+        )
+    except Exception as e:
+        print(f"Could not prefetch existing dates, checking per day: {e}")
+        existing_dates = None
+    
     print(f"Fetching sleep data for the last {DAYS_TO_FETCH} days...")
     
+    missing_dates = []
+    consecutive_skips = 0
     for i in range(DAYS_TO_FETCH):
         current_date = today - timedelta(days=i)
         date_str = current_date.isoformat()
         
         try:
             # Check if already exists
-            if sleep_exists(notion, DATABASE_ID, date_str):
+            if existing_dates is not None:
+                already_synced = date_str in existing_dates
+            else:
+                already_synced = sleep_exists(notion, DATABASE_ID, date_str)
+            if already_synced:
                 skipped_count += 1
+                consecutive_skips += 1
+                if consecutive_skips >= EARLY_EXIT_RUN and i > RESYNC_WINDOW_DAYS:
+                    print(f"Reached {consecutive_skips} consecutive synced days, stopping at {date_str}")
+                    break
                 continue
-            
-            # Fetch from Garmin
-            sleep_data = garmin.get_sleep_data(date_str)
-            
-            if sleep_data and sleep_data.get("dailySleepDTO"):
-                daily_sleep = sleep_data.get("dailySleepDTO", {})
-                total_sleep = (daily_sleep.get("deepSleepSeconds", 0) or 0) + \
-                              (daily_sleep.get("lightSleepSeconds", 0) or 0) + \
-                              (daily_sleep.get("remSleepSeconds", 0) or 0)
+            consecutive_skips = 0
+            missing_dates.append(date_str)
+        except Exception as e:
+            error_count += 1
+            print(f"Error checking {date_str}: {e}")
+    
+    # Fetch missing days from Garmin concurrently, write each as it arrives
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(garmin.get_sleep_data, d): d for d in missing_dates}
+        for future in as_completed(futures):
+            date_str = futures[future]
+            try:
+                sleep_data = future.result()
                 
-                if total_sleep > 0:
-                    write_to_notion(notion, DATABASE_ID, sleep_data, date_str)
-                    added_count += 1
-                    print(f"Created sleep entry for: {date_str} ({seconds_to_hours(total_sleep)}h)")
+                if sleep_data and sleep_data.get("dailySleepDTO"):
+                    summary = summarize_sleep(sleep_data["dailySleepDTO"], date_str)
+                    
+                    if summary["total"] > 0:
+                        write_to_notion(notion, DATABASE_ID, summary)
+                        added_count += 1
+                        print(f"Created sleep entry for: {date_str} ({seconds_to_hours(summary['total'])}h)")
+                    else:
+                        skipped_count += 1
                 else:
                     skipped_count += 1
-            else:
-                skipped_count += 1
-                
-        except Exception as e:
-            error_count += 1
-            if "404" not in str(e) and "No data" not in str(e):
-                print(f"Error fetching {date_str}: {e}")
+                    
+            except Exception as e:
+                error_count += 1
+                if "404" not in str(e) and "No data" not in str(e):
+                    print(f"Error fetching {date_str}: {e}")
     
     print(f"\nSleep sync complete: {added_count} added, {skipped_count} skipped, {error_count} errors")
 
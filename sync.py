@@ -19,17 +19,40 @@ Environment Variables:
 - NOTION_SLEEP_DB_ID: Sleep database ID (optional)
 - SYNC_DAYS: Number of days to sync (default: 7)
 - SYNC_ALL: Set to 'true' for full history sync
+- SYNC_INDEX_DB: Local sync index (default: ~/.cache/garmin-to-notion/index.db)
+
+Options:
+- --rebuild: Forget the local sync index and every section's last clean run,
+  so activities are looked up in Notion again (e.g. after pages were edited
+  or deleted by hand)
 """
 
 import os
+import queue
+import re
 import sys
 import json
+import hashlib
+import sqlite3
+import threading
+from collections import deque
+from dataclasses import dataclass
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from functools import lru_cache, partial
 from pathlib import Path
+from types import MappingProxyType
 from datetime import datetime, timezone, timedelta
+from zoneinfo import ZoneInfo
 
+import httpx
+import orjson
 from garminconnect import Garmin
 from notion_client import Client
-import pytz
+
+from notion_common import (
+    NOTION_CREATE_RETRY_STATUSES, diff_properties, property_differs, read_sync_hash, tag_sync_hash,
+    with_rate_limit_retry,
+)
 
 # Import sync functions from individual modules
 # We'll define them inline to keep everything self-contained
@@ -38,7 +61,7 @@ import pytz
 # CONFIGURATION
 # =============================================================================
 
-local_tz = pytz.timezone('Europe/Brussels')
+local_tz = ZoneInfo('Europe/Brussels')
 
 ACTIVITY_ICONS = {
     "Barre": "https://img.icons8.com/?size=100&id=66924&format=png&color=000000",
@@ -61,7 +84,39 @@ ACTIVITY_ICONS = {
     "Yoga": "https://img.icons8.com/?size=100&id=9783&format=png&color=000000",
 }
 
-MULTIPLE_MATCH = "MULTIPLE_MATCH"
+# Notion icon payloads, built once per type and shared read-only
+ICON_BLOCKS = MappingProxyType({
+    activity_type: {"type": "external", "external": {"url": url}}
+    for activity_type, url in ACTIVITY_ICONS.items()
+})
+
+# Shared read-only default for .get() chains (never mutate)
+_EMPTY = MappingProxyType({})
+
+# Concurrent Notion writes (paced by notion_common.notion_rate_limiter)
+NOTION_WRITE_WORKERS = 3
+# Activity writes queued before the sync loop waits for some to finish,
+# so a full sync holds a bounded number of activities in memory
+NOTION_PENDING_WRITES = 60
+
+# Keep-alive connections held open to api.notion.com
+NOTION_POOL_SIZE = 10
+
+# Per-request timeout for Notion calls (notion-client defaults to 60 s)
+NOTION_TIMEOUT_SECONDS = 30
+
+# Local SQLite index of synced activities (garmin_id -> page_id, sync_hash)
+DEFAULT_SYNC_INDEX_DB = "~/.cache/garmin-to-notion/index.db"
+
+# Garmin batches fetched ahead of the Notion side
+GARMIN_PREFETCH_BATCHES = 2
+
+# Activity pages requested ahead in full-sync mode
+GARMIN_PAGE_WORKERS = 5
+
+# Parallel per-day Garmin requests (steps, sleep); more gains little.
+# Also the cap on Garmin requests in flight across all sections (garmin_slots)
+GARMIN_FETCH_WORKERS = 8
 
 
 # =============================================================================
@@ -103,10 +158,63 @@ def init_garmin_client():
     return garmin
 
 
+# The sync sections run side by side on one Garmin session, each with its own
+# pool; every Garmin call takes a slot so together they stay at
+# GARMIN_FETCH_WORKERS requests in flight
+garmin_slots = threading.BoundedSemaphore(GARMIN_FETCH_WORKERS)
+
+
+def with_garmin_slot(fn, *args):
+    """Call a Garmin API method once a garmin_slots slot is free."""
+    with garmin_slots:
+        return fn(*args)
+
+
+class OrjsonHTTPClient(httpx.Client):
+    """httpx client that encodes request bodies and decodes responses with orjson."""
+    
+    def build_request(self, method, url, *, json=None, headers=None, **kwargs):
+        if json is not None:
+            headers = {**(headers or {}), "Content-Type": "application/json"}
+            kwargs["content"] = orjson.dumps(json)
+        return super().build_request(method, url, headers=headers, **kwargs)
+    
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        response.json = lambda **_: orjson.loads(response.content)
+        return response
+
+
+def init_notion_client(notion_token):
+    """
+    Notion client on one explicit keep-alive connection pool, shared by all
+    sync sections and write workers. Connection failures are retried.
+    Requests go over HTTP/2 and bodies are (de)serialized with orjson.
+    """
+    transport = httpx.HTTPTransport(
+        http2=True,
+        retries=3,
+        limits=httpx.Limits(
+            max_connections=NOTION_POOL_SIZE,
+            max_keepalive_connections=NOTION_POOL_SIZE,
+        ),
+    )
+    return Client(
+        auth=notion_token,
+        client=OrjsonHTTPClient(transport=transport),
+        timeout_ms=NOTION_TIMEOUT_SECONDS * 1000,
+    )
+
+
 # =============================================================================
 # UTILITY FUNCTIONS
 # =============================================================================
 
+# Garmin timestamps: "YYYY-MM-DD HH:MM:SS" or ISO with optional fraction/offset
+_DT_RE = re.compile(r'(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}:\d{2})(?:\.\d+)?(Z|[+-]\d{2}:?\d{2})?')
+
+
+@lru_cache(maxsize=4096)
 def parse_utc_datetime(dt_str):
     """Parse a datetime string from Garmin (UTC) robustly."""
     if not dt_str:
@@ -114,18 +222,19 @@ def parse_utc_datetime(dt_str):
     
     s = dt_str.strip()
     
-    if s.endswith('Z'):
-        s = s[:-1] + '+00:00'
-    
-    if '.' in s:
-        base, rest = s.split('.', 1)
-        tz_part = ''
-        for i, c in enumerate(rest):
-            if c in ['+', '-']:
-                tz_part = rest[i:]
-                break
-        s = base + tz_part
+    m = _DT_RE.fullmatch(s)
+    if m:
+        day, clock, tz_part = m.groups()
+        if not tz_part or tz_part == 'Z':
+            tz_part = '+00:00'
+        elif ':' not in tz_part:
+            tz_part = tz_part[:3] + ':' + tz_part[3:]
+        try:
+            return datetime.fromisoformat(f"{day}T{clock}{tz_part}")
+        except ValueError:
+            return None
     
+    # Anything else: let the standard parsers try
     try:
         dt = datetime.fromisoformat(s)
     except ValueError:
@@ -140,6 +249,7 @@ def parse_utc_datetime(dt_str):
     return dt
 
 
+@lru_cache(maxsize=1024)
 def convert_gmt_to_local(gmt_datetime_str):
     """Convert Garmin's startTimeGMT (UTC) to local timezone."""
     dt_utc = parse_utc_datetime(gmt_datetime_str)
@@ -148,93 +258,87 @@ def convert_gmt_to_local(gmt_datetime_str):
     return dt_utc.astimezone(local_tz).isoformat()
 
 
-def get_local_date_range(gmt_datetime_str):
-    """Get start and end of the LOCAL day for date range filtering."""
+@lru_cache(maxsize=1024)
+def get_local_date(gmt_datetime_str):
+    """LOCAL calendar date (YYYY-MM-DD) of a Garmin UTC timestamp, for equality matching."""
     dt_utc = parse_utc_datetime(gmt_datetime_str)
     if dt_utc is None:
-        return None, None
-    
-    dt_local = dt_utc.astimezone(local_tz)
-    start_of_day = dt_local.replace(hour=0, minute=0, second=0, microsecond=0)
-    end_of_day = start_of_day + timedelta(days=1) - timedelta(seconds=1)
-    
-    return start_of_day.isoformat(), end_of_day.isoformat()
-
+        return None
+    return dt_utc.astimezone(local_tz).date().isoformat()
+
+
+# Garmin type (title-cased) -> (Activity Type, Subactivity Type)
+ACTIVITY_TYPE_MAPPING = {
+    "Barre": ("Strength", "Barre"),
+    "Indoor Cardio": ("Cardio", "Indoor Cardio"),
+    "Indoor Cycling": ("Cycling", "Indoor Cycling"),
+    "Indoor Rowing": ("Rowing", "Indoor Rowing"),
+    "Pilates": ("Yoga/Pilates", "Pilates"),
+    "Rowing V2": ("Rowing", "Rowing V2"),
+    "Speed Walking": ("Walking", "Speed Walking"),
+    "Strength Training": ("Strength", "Strength Training"),
+    "Treadmill Running": ("Running", "Treadmill Running"),
+    "Yoga": ("Yoga/Pilates", "Yoga"),
+}
 
-def approx_equal(a, b, eps=0.01):
-    """Compare two numbers with tolerance."""
-    if a is None or b is None:
-        return a == b
-    return abs(a - b) <= eps
+# Activity name keywords that override the Garmin type, checked in order
+_NAME_OVERRIDES = (
+    ("meditation", ("Meditation", "Meditation")),
+    ("barre", ("Strength", "Barre")),
+    ("stretch", ("Stretching", "Stretching")),
+)
 
 
+@lru_cache(maxsize=1024)
 def format_activity_type(activity_type, activity_name=""):
     """Format activity type and subtype."""
-    formatted_type = activity_type.replace('_', ' ').title() if activity_type else "Unknown"
-    activity_subtype = formatted_type
-    activity_type = formatted_type
-
-    activity_mapping = {
-        "Barre": "Strength",
-        "Indoor Cardio": "Cardio",
-        "Indoor Cycling": "Cycling",
-        "Indoor Rowing": "Rowing",
-        "Speed Walking": "Walking",
-        "Strength Training": "Strength",
-        "Treadmill Running": "Running"
-    }
-
-    if formatted_type == "Rowing V2":
-        activity_type = "Rowing"
-    elif formatted_type in ["Yoga", "Pilates"]:
-        activity_type = "Yoga/Pilates"
-        activity_subtype = formatted_type
-
-    if formatted_type in activity_mapping:
-        activity_type = activity_mapping[formatted_type]
-        activity_subtype = formatted_type
-
-    if activity_name and "meditation" in activity_name.lower():
-        return "Meditation", "Meditation"
-    if activity_name and "barre" in activity_name.lower():
-        return "Strength", "Barre"
-    if activity_name and "stretch" in activity_name.lower():
-        return "Stretching", "Stretching"
+    if activity_name:
+        name_lc = activity_name.lower()
+        for keyword, types in _NAME_OVERRIDES:
+            if keyword in name_lc:
+                return types
     
-    return activity_type, activity_subtype
+    formatted_type = activity_type.replace('_', ' ').title() if activity_type else "Unknown"
+    return ACTIVITY_TYPE_MAPPING.get(formatted_type, (formatted_type, formatted_type))
 
 
+@lru_cache(maxsize=1024)
 def format_entertainment(activity_name):
     if not activity_name:
         return "Unnamed Activity"
     return activity_name.replace('ENTERTAINMENT', 'Netflix')
 
 
+# Garmin training effect message prefix -> label
+TRAINING_MESSAGES = {
+    'NO': 'No Benefit',
+    'MINOR': 'Some Benefit',
+    'RECOVERY': 'Recovery',
+    'MAINTAINING': 'Maintaining',
+    'IMPROVING': 'Impacting',
+    'IMPACTING': 'Impacting',
+    'HIGHLY': 'Highly Impacting',
+    'OVERREACHING': 'Overreaching'
+}
+_TRAINING_MESSAGE_RE = re.compile(r'(%s)_' % '|'.join(TRAINING_MESSAGES))
+
+
+@lru_cache(maxsize=1024)
 def format_training_message(message):
     if not message:
         return "Unknown"
-    messages = {
-        'NO_': 'No Benefit',
-        'MINOR_': 'Some Benefit',
-        'RECOVERY_': 'Recovery',
-        'MAINTAINING_': 'Maintaining',
-        'IMPROVING_': 'Impacting',
-        'IMPACTING_': 'Impacting',
-        'HIGHLY_': 'Highly Impacting',
-        'OVERREACHING_': 'Overreaching'
-    }
-    for key, value in messages.items():
-        if message.startswith(key):
-            return value
-    return message
+    m = _TRAINING_MESSAGE_RE.match(message)
+    return TRAINING_MESSAGES[m.group(1)] if m else message
 
 
+@lru_cache(maxsize=1024)
 def format_training_effect(label):
     if not label:
         return "Unknown"
     return label.replace('_', ' ').title()
 
 
+@lru_cache(maxsize=8192)
 def format_pace(average_speed):
     if average_speed and average_speed > 0:
         pace_min_km = 1000 / (average_speed * 60)
@@ -244,6 +348,7 @@ def format_pace(average_speed):
     return ""
 
 
+@lru_cache(maxsize=8192)
 def format_duration(seconds):
     """Convert seconds to Xh Xm format."""
     if not seconds:
@@ -253,6 +358,7 @@ def format_duration(seconds):
     return f"{hours}h {minutes}m"
 
 
+@lru_cache(maxsize=8192)
 def seconds_to_hours(seconds):
     """Convert seconds to decimal hours."""
     if not seconds:
@@ -264,233 +370,544 @@ def seconds_to_hours(seconds):
 # ACTIVITIES SYNC
 # =============================================================================
 
-def get_recent_activities(garmin, days=7):
-    """Fetch recent activities with cutoff + overlap."""
-    all_activities = []
+def iter_activities(garmin, batch_size=100, cutoff_date=None):
+    """
+    Yield batches of activities page by page, newest first.
+    Stops at the first activity older than cutoff_date.
+    """
     start = 0
-    batch_size = 100
-    # Add 3-day overlap for edge cases
-    cutoff_date = datetime.now(timezone.utc) - timedelta(days=days + 3)
-    
     while True:
-        chunk = garmin.get_activities(start, batch_size)
+        chunk = with_garmin_slot(garmin.get_activities, start, batch_size)
         if not chunk:
-            break
+            return
         
-        for activity in chunk:
-            activity_date_str = activity.get('startTimeGMT')
-            if activity_date_str:
-                activity_date = parse_utc_datetime(activity_date_str)
+        if cutoff_date is not None:
+            for i, activity in enumerate(chunk):
+                activity_date = parse_utc_datetime(activity.get('startTimeGMT'))
                 if activity_date and activity_date < cutoff_date:
-                    print(f"  Reached cutoff date ({days} days ago), stopping fetch")
-                    return all_activities
-            all_activities.append(activity)
+                    if i:
+                        yield chunk[:i]
+                    return
         
+        yield chunk
+        if len(chunk) < batch_size:
+            return  # Last page
         start += batch_size
+
+
+def iter_activities_parallel(garmin, batch_size=200, limit=10000, max_workers=GARMIN_PAGE_WORKERS):
+    """
+    Like iter_activities without a cutoff, but keeps max_workers pages in
+    flight at once. Pages are yielded in order; the first empty or short
+    page ends the scan and cancels the speculative requests past it.
+    """
+    starts = iter(range(0, limit, batch_size))
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        def schedule():
+            start = next(starts, None)
+            if start is not None:
+                size = min(batch_size, limit - start)
+                pending.append((size, executor.submit(with_garmin_slot, garmin.get_activities, start, size)))
+        
+        for _ in range(max_workers):
+            schedule()
+        
+        while pending:
+            size, future = pending.popleft()
+            chunk = future.result()
+            if chunk:
+                yield chunk
+            if not chunk or len(chunk) < size:
+                for _, other in pending:
+                    other.cancel()
+                return
+            schedule()
+
+
+_END_OF_BATCHES = object()
+
+
+def prefetch_in_background(batches, maxsize=GARMIN_PREFETCH_BATCHES):
+    """
+    Run a batch iterator on a background thread, handing batches over
+    through a bounded queue; exceptions are re-raised in the consumer.
+    """
+    handoff = queue.Queue(maxsize=maxsize)
     
-    return all_activities
+    def produce():
+        try:
+            for batch in batches:
+                handoff.put(batch)
+        except Exception as e:
+            handoff.put(e)
+            return
+        handoff.put(_END_OF_BATCHES)
+    
+    threading.Thread(target=produce, daemon=True).start()
+    
+    while True:
+        batch = handoff.get()
+        if batch is _END_OF_BATCHES:
+            return
+        if isinstance(batch, Exception):
+            raise batch
+        yield batch
 
 
-def get_all_activities(garmin, limit=10000):
-    """Fetch all activities (full sync mode)."""
-    all_activities = []
-    start = 0
-    batch_size = 200
+def recent_batch_size(days):
+    """Page size for a recent sync: ~5 activities per day (with overlap), 20-100."""
+    return min(100, max(20, (days + 3) * 5))
+
+
+def run_notion_writes(jobs):
+    """
+    Run (label, job) Notion writes on NOTION_WRITE_WORKERS threads; jobs call
+    with_rate_limit_retry so together they stay under the shared limiter.
+    Yields (label, exception or None) as each write finishes.
+    """
+    with ThreadPoolExecutor(max_workers=NOTION_WRITE_WORKERS) as executor:
+        futures = {executor.submit(job): label for label, job in jobs}
+        for future in as_completed(futures):
+            yield futures[future], future.exception()
+
+
+# Properties loaded by prefetch_existing_index: every one the script writes,
+# so diff_properties compares against the page instead of a missing value
+SYNCED_PROPERTIES = (
+    "Activity Name", "Date", "Activity Type", "Subactivity Type", "Distance (km)", "Duration (min)",
+    "Calories", "Avg Pace", "Avg Power", "Max Power", "Training Effect", "Aerobic", "Aerobic Effect",
+    "Anaerobic", "Anaerobic Effect", "PR", "Fav", "Garmin ID", "Sync Hash",
+)
+
+
+def fetch_database_schema(client, database_id):
+    """{property name: property} of a database, or None if it cannot be read."""
+    try:
+        return with_rate_limit_retry(client.databases.retrieve, database_id=database_id).get("properties", {})
+    except Exception as e:
+        print(f"  Could not read database schema: {e}")
+        return None
+
+
+@lru_cache(maxsize=4096)
+def _local_date_of(date_start):
+    """Local YYYY-MM-DD for a Notion Date start value."""
+    try:
+        dt = datetime.fromisoformat(date_start.replace('Z', '+00:00'))
+    except ValueError:
+        return date_start[:10]
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(local_tz)
+    return dt.date().isoformat()
+
+
+def prefetch_existing_index(client, database_id, since=None, schema=None):
+    """
+    Scan the activities database once (100 pages per request) and index it.
+    With since (a date), only pages dated on or after it are read; with the
+    schema from fetch_database_schema, only SYNCED_PROPERTIES are loaded.
+    Returns ({garmin_id: [pages]}, {(local_date, type, name): [pages]}); the
+    second dict only holds legacy pages without a Garmin ID, so it is empty
+    once the database is backfilled.
+    """
+    by_garmin_id = {}
+    by_date_type_name = {}
+    query_args = {"database_id": database_id, "page_size": 100}
+    if since is not None:
+        query_args["filter"] = {"property": "Date", "date": {"on_or_after": since.isoformat()}}
+    if schema:
+        query_args["filter_properties"] = [schema[name]["id"] for name in SYNCED_PROPERTIES if name in schema]
     
     while True:
-        chunk = garmin.get_activities(start, batch_size)
-        if not chunk:
-            break
-        all_activities.extend(chunk)
-        start += batch_size
-        if len(all_activities) >= limit:
+        query = with_rate_limit_retry(client.databases.query, **query_args)
+        for page in query.get("results", []):
+            props = page.get("properties") or _EMPTY
+            
+            garmin_id = (props.get("Garmin ID") or _EMPTY).get("number")
+            if garmin_id is not None:
+                by_garmin_id.setdefault(int(garmin_id), []).append(page)
+                # Already tied to an activity: never a fallback candidate
+                continue
+            
+            date_start = ((props.get("Date") or _EMPTY).get("date") or _EMPTY).get("start")
+            if date_start:
+                activity_type = ((props.get("Activity Type") or _EMPTY).get("select") or _EMPTY).get("name", "")
+                title = (props.get("Activity Name") or _EMPTY).get("title") or []
+                name = "".join(t.get("plain_text") or (t.get("text") or _EMPTY).get("content", "") for t in title)
+                key = (_local_date_of(date_start), activity_type, name)
+                by_date_type_name.setdefault(key, []).append(page)
+        
+        if not query.get("has_more"):
             break
+        query_args["start_cursor"] = query.get("next_cursor")
     
-    return all_activities[:limit]
+    return by_garmin_id, by_date_type_name
 
 
-def activity_exists_by_garmin_id(client, database_id, garmin_id):
-    """Check if activity exists by Garmin ID."""
-    if garmin_id is None:
-        return None
-    
-    query = client.databases.query(
-        database_id=database_id,
-        filter={"property": "Garmin ID", "number": {"equals": int(garmin_id)}}
-    )
+@dataclass(slots=True, frozen=True)
+class Match:
+    """Index lookup result: one page, several pages (ambiguous), or nothing."""
+    page: dict | None = None
+    ambiguous: bool = False
     
-    results = query.get("results", [])
-    if len(results) == 0:
-        return None
+    @property
+    def found(self):
+        return self.page is not None or self.ambiguous
+
+
+NO_MATCH = Match()
+AMBIGUOUS_MATCH = Match(ambiguous=True)
+
+
+def _match_result(results):
+    """Match for the pages indexed under one key."""
+    if not results:
+        return NO_MATCH
     elif len(results) == 1:
-        return results[0]
+        return Match(page=results[0])
     else:
-        return (MULTIPLE_MATCH, [r['id'] for r in results])
+        return AMBIGUOUS_MATCH
 
 
-def activity_exists_by_date_fallback(client, database_id, activity_date_gmt, activity_type, activity_name):
-    """Fallback check by date + type + name."""
-    start_iso, end_iso = get_local_date_range(activity_date_gmt)
-    if not start_iso or not end_iso:
-        return None
-    
-    query = client.databases.query(
-        database_id=database_id,
-        filter={
-            "and": [
-                {"property": "Date", "date": {"on_or_after": start_iso}},
-                {"property": "Date", "date": {"on_or_before": end_iso}},
-                {"property": "Activity Type", "select": {"equals": activity_type}},
-                {"property": "Activity Name", "title": {"equals": activity_name}}
-            ]
-        }
+def activity_exists_by_garmin_id(by_garmin_id, garmin_id):
+    """Check if activity exists by Garmin ID."""
+    if garmin_id is None:
+        return NO_MATCH
+    return _match_result(by_garmin_id.get(int(garmin_id)))
+
+
+def activity_exists_by_date_fallback(by_date_type_name, activity_date_gmt, activity_type, activity_name):
+    """Fallback check by local date + type + name (exact key, no date range)."""
+    local_date = get_local_date(activity_date_gmt)
+    if not local_date:
+        return NO_MATCH
+    return _match_result(by_date_type_name.get((local_date, activity_type, activity_name)))
+
+
+def find_existing_activity(index, garmin_id, activity_date_gmt, activity_type, activity_name):
+    """
+    Look an activity up by Garmin ID, then by local date + type + name, in
+    the index from prefetch_existing_index (no Notion requests).
+    Returns (Match, "ID" / "FALLBACK" / None).
+    """
+    by_garmin_id, by_date_type_name = index
+    match = activity_exists_by_garmin_id(by_garmin_id, garmin_id)
+    if match.found:
+        return match, "ID"
+    if not by_date_type_name:
+        return NO_MATCH, None  # No legacy rows left to match by date
+    match = activity_exists_by_date_fallback(
+        by_date_type_name, activity_date_gmt, activity_type, activity_name
     )
-    
-    results = query.get("results", [])
-    if len(results) == 0:
-        return None
-    elif len(results) == 1:
-        return results[0]
-    else:
-        return (MULTIPLE_MATCH, [r['id'] for r in results])
+    return match, "FALLBACK" if match.found else None
 
 
-def activity_needs_update(existing_activity, new_activity):
-    """Check if existing activity needs update."""
-    props = existing_activity.get('properties', {})
-    
-    # Check Garmin ID backfill
-    garmin_id_prop = props.get('Garmin ID', {})
-    existing_garmin_id = garmin_id_prop.get('number')
-    new_garmin_id = new_activity.get('activityId')
-    
-    if existing_garmin_id is None and new_garmin_id is not None:
-        return True
-    
-    # Check distance
-    distance_prop = props.get('Distance (km)', {})
-    existing_distance = distance_prop.get('number', 0) or 0
-    new_distance = round(new_activity.get('distance', 0) / 1000, 2)
-    
-    if not approx_equal(existing_distance, new_distance):
-        return True
-    
-    # Check duration
-    duration_prop = props.get('Duration (min)', {})
-    existing_duration = duration_prop.get('number', 0) or 0
-    new_duration = round(new_activity.get('duration', 0) / 60, 2)
-    
-    if not approx_equal(existing_duration, new_duration, eps=0.1):
-        return True
-    
-    return False
+# Properties compared by activity_needs_update, cheapest and most likely to
+# change first. Every one is in SYNCED_PROPERTIES, so the prefetched page has
+# it; "Activity Name" is left out because updates never rewrite it.
+_COMPARED_PROPERTIES = (
+    "PR", "Fav", "Garmin ID", "Calories", "Distance (km)", "Duration (min)", "Avg Power", "Max Power",
+    "Aerobic", "Anaerobic", "Activity Type", "Subactivity Type", "Training Effect", "Aerobic Effect",
+    "Anaerobic Effect", "Avg Pace", "Date",
+)
+
+
+def activity_needs_update(existing_activity, new_props):
+    """
+    Check if existing activity needs update; stops at the first difference.
+    new_props are the activity's build_activity_properties props, so the new
+    values are rounded once and shared with the write. A missing Garmin ID
+    counts as a difference, so it gets backfilled.
+    """
+    props = existing_activity.get('properties') or _EMPTY
+    return any(
+        property_differs(new_props[name], props.get(name))
+        for name in _COMPARED_PROPERTIES if name in new_props
+    )
+
+
+# Tag of the Sync Hash values this script writes (see notion_common.read_sync_hash)
+SYNC_HASH_TAG = "sync-v1"
 
 
-def create_activity(client, database_id, activity):
-    """Create new activity in Notion."""
+def properties_hash(props):
+    """Short, stable fingerprint of a Notion properties payload."""
+    canonical = json.dumps(props, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+def _num(value):
+    return {"number": value}
+
+
+def _sel(name):
+    return {"select": {"name": name}}
+
+
+def _text(content):
+    return {"rich_text": [{"text": {"content": content}}]}
+
+
+def _check(value):
+    return {"checkbox": value}
+
+
+def build_activity_properties(activity):
+    """
+    Notion properties for a Garmin activity (without the Sync Hash, see
+    with_sync_hash). Returns (activity_name, props, icon) with icon an
+    ICON_BLOCKS entry or None.
+    """
     garmin_id = activity.get('activityId')
     activity_date_gmt = activity.get('startTimeGMT')
     activity_name = format_entertainment(activity.get("activityName"))
     activity_type, activity_subtype = format_activity_type(
-        activity.get('activityType', {}).get('typeKey', 'Unknown'),
+        (activity.get('activityType') or _EMPTY).get('typeKey', 'Unknown'),
         activity_name
     )
     
     activity_date_local = convert_gmt_to_local(activity_date_gmt)
-    icon_url = ACTIVITY_ICONS.get(activity_subtype if activity_subtype != activity_type else activity_type)
+    icon = ICON_BLOCKS.get(activity_subtype if activity_subtype != activity_type else activity_type)
     
     props = {
         "Activity Name": {"title": [{"text": {"content": activity_name}}]},
         "Date": {"date": {"start": activity_date_local}},
-        "Activity Type": {"select": {"name": activity_type}},
-        "Subactivity Type": {"select": {"name": activity_subtype}},
-        "Distance (km)": {"number": round(activity.get('distance', 0) / 1000, 2)},
-        "Duration (min)": {"number": round(activity.get('duration', 0) / 60, 2)},
-        "Calories": {"number": round(activity.get('calories', 0))},
-        "Avg Pace": {"rich_text": [{"text": {"content": format_pace(activity.get('averageSpeed', 0))}}]},
-        "Avg Power": {"number": round(activity.get('avgPower', 0), 1)},
-        "Max Power": {"number": round(activity.get('maxPower', 0), 1)},
-        "Training Effect": {"select": {"name": format_training_effect(activity.get('trainingEffectLabel', 'Unknown'))}},
-        "Aerobic": {"number": round(activity.get('aerobicTrainingEffect', 0), 1)},
-        "Aerobic Effect": {"select": {"name": format_training_message(activity.get('aerobicTrainingEffectMessage', 'Unknown'))}},
-        "Anaerobic": {"number": round(activity.get('anaerobicTrainingEffect', 0), 1)},
-        "Anaerobic Effect": {"select": {"name": format_training_message(activity.get('anaerobicTrainingEffectMessage', 'Unknown'))}},
-        "PR": {"checkbox": activity.get('pr', False)},
-        "Fav": {"checkbox": activity.get('favorite', False)}
+        "Activity Type": _sel(activity_type),
+        "Subactivity Type": _sel(activity_subtype),
+        "Distance (km)": _num(round(activity.get('distance', 0) / 1000, 2)),
+        "Duration (min)": _num(round(activity.get('duration', 0) / 60, 2)),
+        "Calories": _num(round(activity.get('calories', 0))),
+        "Avg Pace": _text(format_pace(activity.get('averageSpeed', 0))),
+        "Avg Power": _num(round(activity.get('avgPower', 0), 1)),
+        "Max Power": _num(round(activity.get('maxPower', 0), 1)),
+        "Training Effect": _sel(format_training_effect(activity.get('trainingEffectLabel', 'Unknown'))),
+        "Aerobic": _num(round(activity.get('aerobicTrainingEffect', 0), 1)),
+        "Aerobic Effect": _sel(format_training_message(activity.get('aerobicTrainingEffectMessage', 'Unknown'))),
+        "Anaerobic": _num(round(activity.get('anaerobicTrainingEffect', 0), 1)),
+        "Anaerobic Effect": _sel(format_training_message(activity.get('anaerobicTrainingEffectMessage', 'Unknown'))),
+        "PR": _check(activity.get('pr', False)),
+        "Fav": _check(activity.get('favorite', False))
     }
     
     if garmin_id is not None:
-        props["Garmin ID"] = {"number": int(garmin_id)}
-    
-    page = {"parent": {"database_id": database_id}, "properties": props}
+        props["Garmin ID"] = _num(int(garmin_id))
     
-    if icon_url:
-        page["icon"] = {"type": "external", "external": {"url": icon_url}}
+    return activity_name, props, icon
+
+
+def with_sync_hash(props, sync_column):
+    """props plus their Sync Hash, if the database has a Sync Hash column."""
+    if not sync_column:
+        return props
+    return {**props, "Sync Hash": _text(tag_sync_hash(SYNC_HASH_TAG, properties_hash(props)))}
+
+
+def _is_select_error(error):
+    """Whether Notion rejected a write over a select option."""
+    error_msg = str(error).lower()
+    return any(x in error_msg for x in ["select", "is not a valid", "does not exist"])
+
+
+def _with_unknown_types(props):
+    """props with the activity type selects replaced by "Unknown"."""
+    return {**props, "Activity Type": _sel("Unknown"), "Subactivity Type": _sel("Unknown")}
+
+
+def stored_sync_hash(page):
+    """Sync Hash this script wrote on a Notion page in a previous run, or ''."""
+    return read_sync_hash((page.get('properties') or _EMPTY).get('Sync Hash'), SYNC_HASH_TAG)
+
+
+def _create_page(client, database_id, props, icon, sync_column):
+    page = {"parent": {"database_id": database_id}, "properties": with_sync_hash(props, sync_column)}
+    if icon:
+        page["icon"] = icon
+    created = with_rate_limit_retry(client.pages.create, NOTION_CREATE_RETRY_STATUSES, **page)
+    return created.get('id') if isinstance(created, dict) else None, props
+
+
+def create_activity(client, database_id, activity, built=None, sync_column=False):
+    """
+    Create new activity in Notion. Returns (page_id, props written); Notion
+    errors are raised to the caller, which reports them.
+    built is build_activity_properties(activity) if the caller already has it.
+    """
+    _, props, icon = built or build_activity_properties(activity)
     
     try:
-        client.pages.create(**page)
-        return True
+        return _create_page(client, database_id, props, icon, sync_column)
     except Exception as e:
-        error_msg = str(e).lower()
-        if any(x in error_msg for x in ["select", "is not a valid", "does not exist"]):
-            props["Activity Type"] = {"select": {"name": "Unknown"}}
-            props["Subactivity Type"] = {"select": {"name": "Unknown"}}
-            try:
-                client.pages.create(**{"parent": {"database_id": database_id}, "properties": props})
-                return True
-            except Exception as e2:
-                print(f"    ERROR creating {activity_name}: {e2}")
-                return False
-        print(f"    ERROR creating {activity_name}: {e}")
-        return False
-
-
-def update_activity(client, existing_activity, new_activity):
-    """Update existing activity."""
-    garmin_id = new_activity.get('activityId')
-    activity_date_gmt = new_activity.get('startTimeGMT')
-    activity_name = format_entertainment(new_activity.get("activityName"))
-    activity_type, activity_subtype = format_activity_type(
-        new_activity.get('activityType', {}).get('typeKey', 'Unknown'),
-        activity_name
-    )
+        if not _is_select_error(e):
+            raise
+    # The type selects were rejected: write "Unknown" instead. The hash then
+    # covers what was written, so a later run retries the real types.
+    return _create_page(client, database_id, _with_unknown_types(props), icon, sync_column)
+
+
+def _update_page(client, existing_activity, props, icon, sync_column):
+    # The name is only set on create
+    candidates = {name: prop for name, prop in with_sync_hash(props, sync_column).items() if name != "Activity Name"}
+    update = {"page_id": existing_activity['id'], "properties": diff_properties(candidates, existing_activity)}
     
-    activity_date_local = convert_gmt_to_local(activity_date_gmt)
-    icon_url = ACTIVITY_ICONS.get(activity_subtype if activity_subtype != activity_type else activity_type)
+    if icon and icon != existing_activity.get('icon'):
+        update["icon"] = icon
     
-    props = {
-        "Date": {"date": {"start": activity_date_local}},
-        "Activity Type": {"select": {"name": activity_type}},
-        "Subactivity Type": {"select": {"name": activity_subtype}},
-        "Distance (km)": {"number": round(new_activity.get('distance', 0) / 1000, 2)},
-        "Duration (min)": {"number": round(new_activity.get('duration', 0) / 60, 2)},
-        "Calories": {"number": round(new_activity.get('calories', 0))},
-        "Avg Pace": {"rich_text": [{"text": {"content": format_pace(new_activity.get('averageSpeed', 0))}}]},
-        "Avg Power": {"number": round(new_activity.get('avgPower', 0), 1)},
-        "Max Power": {"number": round(new_activity.get('maxPower', 0), 1)},
-        "Training Effect": {"select": {"name": format_training_effect(new_activity.get('trainingEffectLabel', 'Unknown'))}},
-        "Aerobic": {"number": round(new_activity.get('aerobicTrainingEffect', 0), 1)},
-        "Aerobic Effect": {"select": {"name": format_training_message(new_activity.get('aerobicTrainingEffectMessage', 'Unknown'))}},
-        "Anaerobic": {"number": round(new_activity.get('anaerobicTrainingEffect', 0), 1)},
-        "Anaerobic Effect": {"select": {"name": format_training_message(new_activity.get('anaerobicTrainingEffectMessage', 'Unknown'))}},
-        "PR": {"checkbox": new_activity.get('pr', False)},
-        "Fav": {"checkbox": new_activity.get('favorite', False)}
-    }
+    if update["properties"] or "icon" in update:
+        with_rate_limit_retry(client.pages.update, **update)
+    return existing_activity['id'], props
+
+
+def update_activity(client, existing_activity, new_activity, built=None, sync_column=False):
+    """
+    Update existing activity, sending only the properties that changed.
+    Returns (page_id, props now on the page); Notion errors are raised.
+    """
+    _, props, icon = built or build_activity_properties(new_activity)
     
-    if garmin_id is not None:
-        props["Garmin ID"] = {"number": int(garmin_id)}
+    try:
+        return _update_page(client, existing_activity, props, icon, sync_column)
+    except Exception as e:
+        if not _is_select_error(e):
+            raise
+    return _update_page(client, existing_activity, _with_unknown_types(props), icon, sync_column)
+
+
+def open_sync_index(path):
+    """Open (and create if needed) the local SQLite index of synced activities."""
+    path = Path(path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS idx ("
+        "garmin_id INTEGER PRIMARY KEY, page_id TEXT, sync_hash TEXT, updated_at TEXT, snapshot TEXT)"
+    )
+    # Indexes written before snapshots were kept
+    if "snapshot" not in {column[1] for column in conn.execute("PRAGMA table_info(idx)")}:
+        conn.execute("ALTER TABLE idx ADD COLUMN snapshot TEXT")
+    conn.execute("CREATE TABLE IF NOT EXISTS last_sync (section TEXT PRIMARY KEY, synced_at TEXT)")
+    return conn
+
+
+def load_sync_index(conn):
+    """Return {garmin_id: (page_id, sync_hash)} for every synced activity."""
+    return {garmin_id: (page_id, sync_hash) for garmin_id, page_id, sync_hash in conn.execute(
+        "SELECT garmin_id, page_id, sync_hash FROM idx"
+    )}
+
+
+def load_synced_page(conn, garmin_id, page_id):
+    """
+    The page as this script last wrote it ({'id', 'properties', 'icon'}), so a
+    cached update only sends what changed; just {'id'} if no snapshot is kept.
+    """
+    row = conn.execute("SELECT snapshot FROM idx WHERE garmin_id = ?", (garmin_id,)).fetchone()
+    snapshot = json.loads(row[0]) if row and row[0] else {}
+    return {**snapshot, 'id': page_id}
+
+
+def page_snapshot(properties, icon):
+    """JSON snapshot of a page's synced properties and icon, for load_synced_page."""
+    return json.dumps({'properties': properties, 'icon': icon}, ensure_ascii=False, separators=(',', ':'))
+
+
+def clear_sync_index(conn):
+    """Forget every synced activity and each section's last clean run."""
+    conn.execute("DELETE FROM idx")
+    conn.execute("DELETE FROM last_sync")
+    conn.commit()
+
+
+def record_sync_index(conn, rows, stale_ids=()):
+    """Upsert (garmin_id, page_id, sync_hash, snapshot) rows and drop entries that failed."""
+    updated_at = datetime.now(timezone.utc).isoformat()
+    conn.executemany(
+        "INSERT OR REPLACE INTO idx (garmin_id, page_id, sync_hash, updated_at, snapshot) VALUES (?, ?, ?, ?, ?)",
+        [(garmin_id, page_id, sync_hash, updated_at, snapshot) for garmin_id, page_id, sync_hash, snapshot in rows]
+    )
+    conn.executemany("DELETE FROM idx WHERE garmin_id = ?", [(garmin_id,) for garmin_id in stale_ids])
+    conn.commit()
+
+
+def load_last_sync(conn, section):
+    """When `section` last finished without errors (UTC datetime), or None."""
+    row = conn.execute("SELECT synced_at FROM last_sync WHERE section = ?", (section,)).fetchone()
+    return datetime.fromisoformat(row[0]) if row else None
+
+
+def save_last_sync(conn, section, synced_at):
+    """Record a clean run of `section` that started at synced_at."""
+    conn.execute(
+        "INSERT OR REPLACE INTO last_sync (section, synced_at) VALUES (?, ?)",
+        (section, synced_at.isoformat())
+    )
+    conn.commit()
+
+
+def days_since_last_sync(conn, section, sync_days, overlap, now):
+    """
+    Days a recent sync of `section` still has to cover: sync_days at most,
+    and only back to its last clean run (plus `overlap` days) if there is one.
+    """
+    last = load_last_sync(conn, section)
+    if last is None:
+        return sync_days
+    return max(1, min(sync_days, (now - last).days + overlap))
+
+
+def lookup_activity(activity, built, sync_hash, sync_index, get_notion_index, get_synced_page):
+    """
+    Decide what to do with one Garmin activity, from the local index or the
+    prefetched Notion index (get_notion_index loads it on first use).
+    built is build_activity_properties(activity), sync_hash its Sync Hash;
+    get_synced_page(garmin_id, page_id) is the page as last written.
+    Returns (action, page): "SKIPPED" / "CREATED" with None, "UPDATED
+    (CACHE|ID|FALLBACK)" with the page to update, or "UNCHANGED" with the
+    page if it should be (re)recorded in the local index, else None.
+    """
+    garmin_id = activity.get('activityId')
     
-    update = {"page_id": existing_activity['id'], "properties": props}
+    cached = sync_index.get(garmin_id) if garmin_id is not None else None
+    if cached:
+        page_id, cached_hash = cached
+        if cached_hash == sync_hash:
+            return "UNCHANGED", None
+        page = get_synced_page(garmin_id, page_id)
+        # Seeded from a page without a Sync Hash of ours: compare the fields
+        if not cached_hash and not activity_needs_update(page, built[1]):
+            return "UNCHANGED", page
+        return "UPDATED (CACHE)", page
+    
+    activity_name, new_props, _ = built
+    activity_type = new_props["Activity Type"]["select"]["name"]
+    match, lookup_method = find_existing_activity(
+        get_notion_index(), garmin_id, activity.get('startTimeGMT'), activity_type, activity_name
+    )
     
-    if icon_url:
-        update["icon"] = {"type": "external", "external": {"url": icon_url}}
+    if match.ambiguous:
+        return "SKIPPED", None
     
-    try:
-        client.pages.update(**update)
-        return True
-    except Exception as e:
-        print(f"    ERROR updating {activity_name}: {e}")
-        return False
+    existing = match.page
+    if not existing:
+        return "CREATED", None
+    
+    # A stored Sync Hash covers every field; pages without one of ours
+    # (or missing their Garmin ID) use activity_needs_update
+    stored_hash = stored_sync_hash(existing)
+    existing_props = existing.get('properties') or _EMPTY
+    has_garmin_id = (existing_props.get('Garmin ID') or _EMPTY).get('number') is not None
+    if stored_hash and has_garmin_id:
+        needs_update = stored_hash != sync_hash
+    else:
+        needs_update = activity_needs_update(existing, new_props)
+    return (f"UPDATED ({lookup_method})" if needs_update else "UNCHANGED"), existing
+
+
+def apply_activity(notion, database_id, activity, page, built=None, sync_column=False):
+    """Write one activity: update page if given, otherwise create it."""
+    if page:
+        return update_activity(notion, page, activity, built, sync_column)
+    return create_activity(notion, database_id, activity, built, sync_column)
 
 
 def sync_activities(garmin, notion, database_id, sync_days, sync_all):
@@ -501,54 +918,119 @@ def sync_activities(garmin, notion, database_id, sync_days, sync_all):
     
     if sync_all:
         print("Mode: FULL SYNC (all history)")
-        activities = get_all_activities(garmin)
+        batches = iter_activities_parallel(garmin, limit=10000)
+        index_since = None
     else:
         print(f"Mode: Last {sync_days} days (+ 3 day overlap)")
-        activities = get_recent_activities(garmin, days=sync_days)
-    
-    print(f"Found {len(activities)} activities to process")
+        # Add 3-day overlap for edge cases
+        cutoff_date = datetime.now(timezone.utc) - timedelta(days=sync_days + 3)
+        batches = iter_activities(garmin, recent_batch_size(sync_days), cutoff_date)
+        # Older pages cannot match; one extra day covers the UTC/local shift
+        index_since = cutoff_date.date() - timedelta(days=1)
     
     created = updated = unchanged = skipped = errors = 0
-    
-    for activity in activities:
-        garmin_id = activity.get('activityId')
-        activity_date_gmt = activity.get('startTimeGMT')
-        activity_name = format_entertainment(activity.get('activityName', 'Unnamed Activity'))
-        activity_type, _ = format_activity_type(
-            activity.get('activityType', {}).get('typeKey', 'Unknown'),
-            activity_name
-        )
-        
-        existing = activity_exists_by_garmin_id(notion, database_id, garmin_id)
-        
-        if isinstance(existing, tuple) and existing[0] == MULTIPLE_MATCH:
-            skipped += 1
-            continue
-        
-        if not existing:
-            existing = activity_exists_by_date_fallback(
-                notion, database_id, activity_date_gmt, activity_type, activity_name
-            )
-            if isinstance(existing, tuple) and existing[0] == MULTIPLE_MATCH:
-                skipped += 1
-                continue
-        
-        if existing:
-            if activity_needs_update(existing, activity):
-                if update_activity(notion, existing, activity):
-                    updated += 1
-                    print(f"  UPDATED: {activity_name}")
-                else:
-                    errors += 1
-            else:
-                unchanged += 1
+    processed = 0
+    
+    # The Sync Hash column is optional; without it the local index alone
+    # remembers what was written
+    schema = fetch_database_schema(notion, database_id)
+    sync_column = bool(schema) and "Sync Hash" in schema
+    if schema is not None and not sync_column:
+        print("  No 'Sync Hash' column in the Activities database; relying on the local sync index")
+    
+    # Activities in the local index since the last run need no Notion reads
+    index_conn = open_sync_index(os.getenv("SYNC_INDEX_DB", DEFAULT_SYNC_INDEX_DB))
+    sync_index = load_sync_index(index_conn)
+    synced_rows = []
+    stale_ids = []
+    
+    # One scan of the database replaces the per-activity lookup queries,
+    # done only once an activity is missing from the local index
+    notion_index = []
+    
+    def get_notion_index():
+        if not notion_index:
+            notion_index.append(prefetch_existing_index(notion, database_id, since=index_since, schema=schema))
+            # Seed the local index from every page tied to one activity; pages
+            # without a Sync Hash of ours get '' and are compared field by field
+            for known_id, pages in notion_index[0][0].items():
+                if len(pages) == 1:
+                    page = pages[0]
+                    synced_rows.append((
+                        known_id, page['id'], stored_sync_hash(page),
+                        page_snapshot(page.get('properties'), page.get('icon')),
+                    ))
+        return notion_index[0]
+    
+    writes = {}
+    
+    def finish(future):
+        nonlocal created, updated, errors
+        action, activity_name, garmin_id, icon = writes.pop(future)
+        # Errors are reported here, not on the pool thread
+        error = future.exception()
+        if error:
+            errors += 1
+            print(f"    ERROR {'creating' if action == 'CREATED' else 'updating'} {activity_name}: {error}")
+            if action == "UPDATED (CACHE)":
+                # The cached page may be gone; look it up again next run
+                stale_ids.append(garmin_id)
+            return
+        page_id, written_props = future.result()
+        if action == "CREATED":
+            created += 1
+            print(f"  CREATED: {activity_name}")
         else:
-            if create_activity(notion, database_id, activity):
-                created += 1
-                print(f"  CREATED: {activity_name}")
-            else:
-                errors += 1
+            updated += 1
+            print(f"  {action}: {activity_name}")
+        if garmin_id is not None and page_id:
+            # Hash what was written (it may differ from the build after a fallback)
+            synced_rows.append((
+                int(garmin_id), page_id, properties_hash(written_props),
+                page_snapshot(with_sync_hash(written_props, sync_column), icon),
+            ))
+    
+    # Garmin pages are fetched on a background thread while lookups run here
+    # and writes run in the pool; counters stay on this thread, and finished
+    # writes are collected as we go so nothing accumulates across batches
+    batches = prefetch_in_background(batches)
+    with ThreadPoolExecutor(max_workers=NOTION_WRITE_WORKERS) as executor:
+        for batch in batches:
+            for activity in batch:
+                processed += 1
+                # Built once and shared by the hash check and the write
+                built = build_activity_properties(activity)
+                sync_hash = properties_hash(built[1])
+                action, page = lookup_activity(
+                    activity, built, sync_hash, sync_index, get_notion_index, partial(load_synced_page, index_conn)
+                )
+                
+                if action == "UNCHANGED":
+                    unchanged += 1
+                    garmin_id = activity.get('activityId')
+                    if page and garmin_id is not None:
+                        # In sync without a write: remember it so the next run skips Notion
+                        synced_rows.append((
+                            int(garmin_id), page['id'], sync_hash,
+                            page_snapshot(page.get('properties'), page.get('icon')),
+                        ))
+                elif action == "SKIPPED":
+                    skipped += 1
+                else:
+                    future = executor.submit(apply_activity, notion, database_id, activity, page, built, sync_column)
+                    writes[future] = (action, built[0], activity.get('activityId'), built[2])
+                    if len(writes) >= NOTION_PENDING_WRITES:
+                        done, _ = wait(writes, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            finish(future)
+        
+        for future in as_completed(list(writes)):
+            finish(future)
+    
+    record_sync_index(index_conn, synced_rows, stale_ids)
+    index_conn.close()
     
+    print(f"Processed {processed} activities")
     print(f"\n✅ Activities: {created} created, {updated} updated, {unchanged} unchanged, {skipped} skipped, {errors} errors")
     return created, updated, errors
 
@@ -557,6 +1039,7 @@ def sync_activities(garmin, notion, database_id, sync_days, sync_all):
 # PERSONAL RECORDS SYNC
 # =============================================================================
 
+@lru_cache(maxsize=1024)
 def get_icon_for_record(activity_name):
     icon_map = {
         "1K": "🥇", "1mi": "⚡", "5K": "👟", "10K": "⭐",
@@ -568,6 +1051,7 @@ def get_icon_for_record(activity_name):
     return icon_map.get(activity_name, "🏅")
 
 
+@lru_cache(maxsize=1024)
 def replace_activity_name_by_typeId(typeId):
     typeId_name_map = {
         1: "1K", 2: "1mi", 3: "5K", 4: "10K",
@@ -579,6 +1063,7 @@ def replace_activity_name_by_typeId(typeId):
     return typeId_name_map.get(typeId, "Unnamed Activity")
 
 
+@lru_cache(maxsize=1024)
 def format_garmin_pr_value(value, typeId):
     """Format PR value based on type."""
     if typeId == 1:  # 1K
@@ -637,6 +1122,67 @@ def format_garmin_pr_value(value, typeId):
     return str(value), ""
 
 
+def build_pr_page(database_id, record):
+    """Return (record name, pages.create kwargs) for a Garmin personal record."""
+    activity_date = record.get('prStartTimeGmtFormatted')
+    activity_type = (record.get('activityType') or 'Walking').replace('_', ' ').title()
+    activity_name = replace_activity_name_by_typeId(record.get('typeId'))
+    typeId = record.get('typeId', 0)
+    value, pace = format_garmin_pr_value(record.get('value', 0), typeId)
+    return activity_name, {
+        "parent": {"database_id": database_id},
+        "properties": {
+            "Date": {"date": {"start": activity_date}},
+            "Activity Type": {"select": {"name": activity_type}},
+            "Record": {"title": [{"text": {"content": activity_name}}]},
+            "typeId": {"number": typeId},
+            "PR": {"checkbox": True},
+            "Value": {"rich_text": [{"text": {"content": value}}]},
+            "Pace": {"rich_text": [{"text": {"content": pace}}]}
+        },
+        "icon": {"emoji": get_icon_for_record(activity_name)},
+    }
+
+
+def replace_pr(notion, old_page_id, page):
+    """Uncheck PR on the previous record page, then create the new one."""
+    with_rate_limit_retry(notion.pages.update, page_id=old_page_id, properties={"PR": {"checkbox": False}})
+    return with_rate_limit_retry(notion.pages.create, NOTION_CREATE_RETRY_STATUSES, **page)
+
+
+def fetch_current_prs(notion, database_id):
+    """
+    Return {typeId: page} for the rows currently flagged PR, read with one
+    paginated query; if a typeId is flagged twice the latest date wins.
+    """
+    current = {}
+    query_args = {
+        "database_id": database_id,
+        "page_size": 100,
+        "filter": {"property": "PR", "checkbox": {"equals": True}},
+    }
+    while True:
+        query = with_rate_limit_retry(notion.databases.query, **query_args)
+        for page in query["results"]:
+            props = page["properties"]
+            typeId = (props.get("typeId") or _EMPTY).get("number")
+            if typeId is None:
+                continue
+            previous = current.get(typeId)
+            if previous is None or _pr_date(page) > _pr_date(previous):
+                current[typeId] = page
+        if not query.get("has_more"):
+            break
+        query_args["start_cursor"] = query.get("next_cursor")
+    return current
+
+
+def _pr_date(page):
+    """UTC datetime of a PR row's Date (datetime.min if unset), for ordering."""
+    date_prop = (page["properties"].get("Date") or _EMPTY).get("date") or _EMPTY
+    return parse_utc_datetime(date_prop.get("start")) or datetime.min.replace(tzinfo=timezone.utc)
+
+
 def sync_personal_records(garmin, notion, database_id):
     """Sync personal records from Garmin to Notion."""
     print("\n" + "=" * 50)
@@ -647,90 +1193,119 @@ def sync_personal_records(garmin, notion, database_id):
         print("⚠️ NOTION_PR_DB_ID not set, skipping")
         return 0, 0, 0
     
-    records = garmin.get_personal_record()
+    records = with_garmin_slot(garmin.get_personal_record)
     filtered_records = [r for r in records if r.get('typeId') != 16]
     
     print(f"Found {len(filtered_records)} personal records")
     
     created = updated = errors = 0
+    writes = []
     
-    for record in filtered_records:
-        activity_date = record.get('prStartTimeGmtFormatted')
-        activity_type = (record.get('activityType') or 'Walking').replace('_', ' ').title()
-        activity_name = replace_activity_name_by_typeId(record.get('typeId'))
-        typeId = record.get('typeId', 0)
-        value, pace = format_garmin_pr_value(record.get('value', 0), typeId)
+    # Garmin's "2024-05-01T08:00:00.0" and Notion's "2024-05-01T08:00:00.000+00:00"
+    # are compared as datetimes; as strings they do not order reliably
+    current_prs = fetch_current_prs(notion, database_id)
+    
+    # Pages are built up front; the loop below only compares and queues writes
+    pr_pages = [(record.get('typeId', 0), *build_pr_page(database_id, record)) for record in filtered_records]
+    
+    for typeId, activity_name, page in pr_pages:
+        activity_date = parse_utc_datetime(page["properties"]["Date"]["date"]["start"])
         
         # Check if exists
-        query = notion.databases.query(
-            database_id=database_id,
-            filter={
-                "and": [
-                    {"property": "Record", "title": {"equals": activity_name}},
-                    {"property": "PR", "checkbox": {"equals": True}}
-                ]
-            }
-        )
-        existing = query['results'][0] if query['results'] else None
+        existing = current_prs.get(typeId)
         
         if existing:
             try:
-                existing_date = existing['properties']['Date']['date']['start']
-                if activity_date and activity_date > existing_date:
+                if activity_date and activity_date > _pr_date(existing):
                     # Archive old, create new
-                    notion.pages.update(
-                        page_id=existing['id'],
-                        properties={"PR": {"checkbox": False}}
-                    )
-                    notion.pages.create(
-                        parent={"database_id": database_id},
-                        properties={
-                            "Date": {"date": {"start": activity_date}},
-                            "Activity Type": {"select": {"name": activity_type}},
-                            "Record": {"title": [{"text": {"content": activity_name}}]},
-                            "typeId": {"number": typeId},
-                            "PR": {"checkbox": True},
-                            "Value": {"rich_text": [{"text": {"content": value}}]},
-                            "Pace": {"rich_text": [{"text": {"content": pace}}]}
-                        },
-                        icon={"emoji": get_icon_for_record(activity_name)}
-                    )
-                    created += 1
-                    print(f"  NEW PR: {activity_name}")
+                    writes.append((("NEW PR", activity_name), partial(replace_pr, notion, existing['id'], page)))
                 else:
                     updated += 1
             except Exception as e:
                 errors += 1
                 print(f"  ERROR: {activity_name}: {e}")
         else:
-            try:
-                notion.pages.create(
-                    parent={"database_id": database_id},
-                    properties={
-                        "Date": {"date": {"start": activity_date}},
-                        "Activity Type": {"select": {"name": activity_type}},
-                        "Record": {"title": [{"text": {"content": activity_name}}]},
-                        "typeId": {"number": typeId},
-                        "PR": {"checkbox": True},
-                        "Value": {"rich_text": [{"text": {"content": value}}]},
-                        "Pace": {"rich_text": [{"text": {"content": pace}}]}
-                    },
-                    icon={"emoji": get_icon_for_record(activity_name)}
-                )
-                created += 1
-                print(f"  CREATED: {activity_name}")
-            except Exception as e:
-                errors += 1
-                print(f"  ERROR: {activity_name}: {e}")
+            writes.append((
+                ("CREATED", activity_name),
+                partial(with_rate_limit_retry, notion.pages.create, NOTION_CREATE_RETRY_STATUSES, **page)
+            ))
+    
+    for (action, activity_name), error in run_notion_writes(writes):
+        if error:
+            errors += 1
+            print(f"  ERROR: {activity_name}: {error}")
+        else:
+            created += 1
+            print(f"  {action}: {activity_name}")
     
     print(f"\n✅ Personal Records: {created} created/updated, {errors} errors")
     return created, updated, errors
 
 
+# =============================================================================
+# DATE-KEYED DATABASES (steps, sleep)
+# =============================================================================
+
+def fetch_existing_dates(notion, database_id, date_property, since_date):
+    """Return the set of ISO dates on or after since_date in date_property.
+
+    One paginated range query (100 rows per request) replaces an existence
+    query per day.
+    """
+    existing_dates = set()
+    query_args = {
+        "database_id": database_id,
+        "page_size": 100,
+        "filter": {"property": date_property, "date": {"on_or_after": since_date.isoformat()}},
+    }
+    while True:
+        query = with_rate_limit_retry(notion.databases.query, **query_args)
+        for page in query["results"]:
+            date_prop = (page["properties"].get(date_property) or _EMPTY).get("date")
+            if date_prop and date_prop.get("start"):
+                existing_dates.add(date_prop["start"][:10])
+        if not query.get("has_more"):
+            break
+        query_args["start_cursor"] = query.get("next_cursor")
+    return existing_dates
+
+
+def recent_date_strs(today, days):
+    """ISO dates from today back over `days` days, newest first."""
+    return [(today - timedelta(days=i)).isoformat() for i in range(days)]
+
+
+def fetch_days_from_garmin(fetch, date_strs):
+    """
+    Call fetch(date_str) for every day on GARMIN_FETCH_WORKERS threads,
+    sharing garmin_slots with the other sections.
+    Yields (date_str, data, exception or None) as each day arrives.
+    """
+    with ThreadPoolExecutor(max_workers=GARMIN_FETCH_WORKERS) as executor:
+        futures = {executor.submit(with_garmin_slot, fetch, date_str): date_str for date_str in date_strs}
+        for future in as_completed(futures):
+            error = future.exception()
+            yield futures[future], None if error else future.result(), error
+
+
 # =============================================================================
 # DAILY STEPS SYNC (for dedicated Daily Steps database)
 # =============================================================================
 
+def build_steps_page(database_id, date_str, steps_data):
+    """pages.create kwargs for one day of Garmin steps data."""
+    return {
+        "parent": {"database_id": database_id},
+        "properties": {
+            "Activity Type": {"title": [{"text": {"content": "Daily Steps"}}]},
+            "Date": {"date": {"start": date_str}},
+            "Total Steps": {"number": steps_data.get("totalSteps")},
+            "Total Distance (km)": {"number": round(steps_data.get("totalDistanceMeters", 0) / 1000, 2)},
+            "Step Goal": {"number": steps_data.get("dailyStepGoal", 10000)}
+        },
+    }
+
+
 def sync_daily_steps(garmin, notion, database_id, sync_days, sync_all):
     """Sync daily steps from Garmin to dedicated Daily Steps database.
     
@@ -749,51 +1324,46 @@ def sync_daily_steps(garmin, notion, database_id, sync_days, sync_all):
     
     today = datetime.now().date()
     created = skipped = errors = 0
+    writes = []
+    
+    try:
+        existing_dates = fetch_existing_dates(
+            notion, database_id, "Date", today - timedelta(days=days_to_fetch - 1)
+        )
+    except Exception as e:
+        print(f"  ERROR loading existing dates: {e}")
+        return 0, 0, 1
+    
+    # Check if entry already exists (by Date)
+    date_strs = recent_date_strs(today, days_to_fetch)
+    missing_dates = [date_str for date_str in date_strs if date_str not in existing_dates]
+    skipped += len(date_strs) - len(missing_dates)
     
-    for i in range(days_to_fetch):
-        current_date = today - timedelta(days=i)
-        date_str = current_date.isoformat()
+    # Get steps data from Garmin
+    for date_str, steps_data, error in fetch_days_from_garmin(garmin.get_user_summary, missing_dates):
+        if error:
+            errors += 1
+            if "404" not in str(error):
+                print(f"  ERROR {date_str}: {error}")
+            continue
         
-        try:
-            # Check if entry already exists (by Date)
-            query = notion.databases.query(
-                database_id=database_id,
-                filter={"property": "Date", "date": {"equals": date_str}}
-            )
-            if query["results"]:
-                skipped += 1
-                continue
-            
-            # Get steps data from Garmin
-            steps_data = garmin.get_user_summary(date_str)
-            
-            if not steps_data:
-                skipped += 1
-                continue
-            
-            total_steps = steps_data.get("totalSteps")
-            if not total_steps or total_steps == 0:
-                skipped += 1
-                continue
-            
-            # Create new steps entry
-            notion.pages.create(
-                parent={"database_id": database_id},
-                properties={
-                    "Activity Type": {"title": [{"text": {"content": "Daily Steps"}}]},
-                    "Date": {"date": {"start": date_str}},
-                    "Total Steps": {"number": total_steps},
-                    "Total Distance (km)": {"number": round(steps_data.get("totalDistanceMeters", 0) / 1000, 2)},
-                    "Step Goal": {"number": steps_data.get("dailyStepGoal", 10000)}
-                }
-            )
-            created += 1
-            print(f"  CREATED: {date_str} ({total_steps} steps)")
-                
-        except Exception as e:
+        total_steps = (steps_data or {}).get("totalSteps")
+        if not total_steps:
+            skipped += 1
+            continue
+        
+        writes.append((
+            (date_str, f"{total_steps} steps"),
+            partial(with_rate_limit_retry, notion.pages.create, NOTION_CREATE_RETRY_STATUSES, **build_steps_page(database_id, date_str, steps_data))
+        ))
+    
+    for (date_str, detail), error in run_notion_writes(writes):
+        if error:
             errors += 1
-            if "404" not in str(e):
-                print(f"  ERROR {date_str}: {e}")
+            print(f"  ERROR {date_str}: {error}")
+        else:
+            created += 1
+            print(f"  CREATED: {date_str} ({detail})")
     
     print(f"\n✅ Daily Steps: {created} created, {skipped} skipped, {errors} errors")
     return created, skipped, errors
@@ -803,6 +1373,48 @@ def sync_daily_steps(garmin, notion, database_id, sync_days, sync_all):
 # SLEEP DATA SYNC (for dedicated Sleep Data database)
 # =============================================================================
 
+def build_sleep_page(database_id, date_str, daily):
+    """pages.create kwargs for one night of Garmin dailySleepDTO data."""
+    deep = daily.get("deepSleepSeconds") or 0
+    light = daily.get("lightSleepSeconds") or 0
+    rem = daily.get("remSleepSeconds") or 0
+    awake = daily.get("awakeSleepSeconds") or 0
+    total = deep + light + rem
+    
+    # Format sleep times
+    times_str = ""
+    start = daily.get("sleepStartTimestampLocal")
+    end = daily.get("sleepEndTimestampLocal")
+    if start and end:
+        try:
+            start_t = datetime.fromisoformat(start.replace("Z", "")).strftime("%H:%M")
+            end_t = datetime.fromisoformat(end.replace("Z", "")).strftime("%H:%M")
+            times_str = f"{start_t} - {end_t}"
+        except:
+            pass
+    
+    return {
+        "parent": {"database_id": database_id},
+        "properties": {
+            "Date": {"title": [{"text": {"content": date_str}}]},
+            "Long Date": {"date": {"start": date_str}},
+            "Times": {"rich_text": [{"text": {"content": times_str}}]},
+            "Total Sleep": {"rich_text": [{"text": {"content": format_duration(total)}}]},
+            "Total Sleep (h)": {"number": seconds_to_hours(total)},
+            "Deep Sleep": {"rich_text": [{"text": {"content": format_duration(deep)}}]},
+            "Deep Sleep (h)": {"number": seconds_to_hours(deep)},
+            "Light Sleep": {"rich_text": [{"text": {"content": format_duration(light)}}]},
+            "Light Sleep (h)": {"number": seconds_to_hours(light)},
+            "REM Sleep": {"rich_text": [{"text": {"content": format_duration(rem)}}]},
+            "REM Sleep (h)": {"number": seconds_to_hours(rem)},
+            "Awake Time": {"rich_text": [{"text": {"content": format_duration(awake)}}]},
+            "Awake Time (h)": {"number": seconds_to_hours(awake)},
+            "Resting HR": {"number": daily.get("restingHeartRate") or 0},
+            "Sleep Goal": {"checkbox": total >= 25200}  # 7 hours
+        },
+    }
+
+
 def sync_sleep_data(garmin, notion, database_id, sync_days, sync_all):
     """Sync sleep data from Garmin to dedicated Sleep Data database.
     
@@ -822,79 +1434,51 @@ def sync_sleep_data(garmin, notion, database_id, sync_days, sync_all):
     
     today = datetime.now().date()
     created = skipped = errors = 0
+    writes = []
+    
+    try:
+        existing_dates = fetch_existing_dates(
+            notion, database_id, "Long Date", today - timedelta(days=days_to_fetch - 1)
+        )
+    except Exception as e:
+        print(f"  ERROR loading existing dates: {e}")
+        return 0, 0, 1
     
-    for i in range(days_to_fetch):
-        current_date = today - timedelta(days=i)
-        date_str = current_date.isoformat()
+    # Check if entry already exists (by Long Date)
+    date_strs = recent_date_strs(today, days_to_fetch)
+    missing_dates = [date_str for date_str in date_strs if date_str not in existing_dates]
+    skipped += len(date_strs) - len(missing_dates)
+    
+    # Get sleep data from Garmin
+    for date_str, sleep_data, error in fetch_days_from_garmin(garmin.get_sleep_data, missing_dates):
+        if error:
+            errors += 1
+            if "404" not in str(error):
+                print(f"  ERROR {date_str}: {error}")
+            continue
         
-        try:
-            # Check if entry already exists (by Long Date)
-            query = notion.databases.query(
-                database_id=database_id,
-                filter={"property": "Long Date", "date": {"equals": date_str}}
-            )
-            if query["results"]:
-                skipped += 1
-                continue
-            
-            # Get sleep data from Garmin
-            sleep_data = garmin.get_sleep_data(date_str)
-            
-            if not sleep_data or not sleep_data.get("dailySleepDTO"):
-                skipped += 1
-                continue
-            
-            daily = sleep_data.get("dailySleepDTO", {})
-            deep = daily.get("deepSleepSeconds") or 0
-            light = daily.get("lightSleepSeconds") or 0
-            rem = daily.get("remSleepSeconds") or 0
-            awake = daily.get("awakeSleepSeconds") or 0
-            total = deep + light + rem
-            
-            if total == 0:
-                skipped += 1
-                continue
-            
-            # Format sleep times
-            times_str = ""
-            start = daily.get("sleepStartTimestampLocal")
-            end = daily.get("sleepEndTimestampLocal")
-            if start and end:
-                try:
-                    start_t = datetime.fromisoformat(start.replace("Z", "")).strftime("%H:%M")
-                    end_t = datetime.fromisoformat(end.replace("Z", "")).strftime("%H:%M")
-                    times_str = f"{start_t} - {end_t}"
-                except:
-                    pass
-            
-            # Create new sleep entry
-            notion.pages.create(
-                parent={"database_id": database_id},
-                properties={
-                    "Date": {"title": [{"text": {"content": date_str}}]},
-                    "Long Date": {"date": {"start": date_str}},
-                    "Times": {"rich_text": [{"text": {"content": times_str}}]},
-                    "Total Sleep": {"rich_text": [{"text": {"content": format_duration(total)}}]},
-                    "Total Sleep (h)": {"number": seconds_to_hours(total)},
-                    "Deep Sleep": {"rich_text": [{"text": {"content": format_duration(deep)}}]},
-                    "Deep Sleep (h)": {"number": seconds_to_hours(deep)},
-                    "Light Sleep": {"rich_text": [{"text": {"content": format_duration(light)}}]},
-                    "Light Sleep (h)": {"number": seconds_to_hours(light)},
-                    "REM Sleep": {"rich_text": [{"text": {"content": format_duration(rem)}}]},
-                    "REM Sleep (h)": {"number": seconds_to_hours(rem)},
-                    "Awake Time": {"rich_text": [{"text": {"content": format_duration(awake)}}]},
-                    "Awake Time (h)": {"number": seconds_to_hours(awake)},
-                    "Resting HR": {"number": daily.get("restingHeartRate") or 0},
-                    "Sleep Goal": {"checkbox": total >= 25200}  # 7 hours
-                }
-            )
-            created += 1
-            print(f"  CREATED: {date_str} ({format_duration(total)})")
-                
-        except Exception as e:
+        daily = (sleep_data or {}).get("dailySleepDTO")
+        if not daily:
+            skipped += 1
+            continue
+        
+        total = (daily.get("deepSleepSeconds") or 0) + (daily.get("lightSleepSeconds") or 0) + (daily.get("remSleepSeconds") or 0)
+        if total == 0:
+            skipped += 1
+            continue
+        
+        writes.append((
+            (date_str, format_duration(total)),
+            partial(with_rate_limit_retry, notion.pages.create, NOTION_CREATE_RETRY_STATUSES, **build_sleep_page(database_id, date_str, daily))
+        ))
+    
+    for (date_str, detail), error in run_notion_writes(writes):
+        if error:
             errors += 1
-            if "404" not in str(e):
-                print(f"  ERROR {date_str}: {e}")
+            print(f"  ERROR {date_str}: {error}")
+        else:
+            created += 1
+            print(f"  CREATED: {date_str} ({detail})")
     
     print(f"\n✅ Sleep Data: {created} created, {skipped} skipped, {errors} errors")
     return created, skipped, errors
@@ -904,6 +1488,47 @@ def sync_sleep_data(garmin, notion, database_id, sync_days, sync_all):
 # MAIN
 # =============================================================================
 
+class SectionConsole:
+    """
+    sys.stdout stand-in for running sync sections in parallel: each complete
+    line a thread inside run_labelled() prints is written at once, under a
+    lock, prefixed with its section label, so nothing is held back if the
+    job is killed. Other threads write straight through.
+    """
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self.lock = threading.Lock()
+        self.local = threading.local()
+    
+    def write(self, text):
+        label = getattr(self.local, "label", None)
+        if label is None:
+            with self.lock:
+                return self.stream.write(text)
+        # print() sends the text and the newline separately: keep the
+        # unfinished line until it is complete
+        *lines, self.local.partial = (self.local.partial + text).split("\n")
+        if lines:
+            with self.lock:
+                self.stream.write("".join(f"[{label}] {line}\n" for line in lines))
+                self.stream.flush()
+        return len(text)
+    
+    def flush(self):
+        with self.lock:
+            self.stream.flush()
+    
+    def run_labelled(self, label, fn, *args):
+        self.local.label, self.local.partial = label, ""
+        try:
+            return fn(*args)
+        finally:
+            if self.local.partial:
+                self.write("\n")
+            self.local.label = None
+
+
 def main():
     print("=" * 60)
     print("🚀 GARMIN TO NOTION UNIFIED SYNC")
@@ -931,7 +1556,7 @@ def main():
         print("❌ NOTION_TOKEN not set")
         sys.exit(1)
     
-    notion = Client(auth=notion_token)
+    notion = init_notion_client(notion_token)
     print("✅ Notion client initialized")
     
     # Get database IDs
@@ -944,29 +1569,67 @@ def main():
         print("❌ NOTION_DB_ID not set")
         sys.exit(1)
     
-    # Run all syncs with the SAME Garmin session
+    # Recent syncs only go back to each section's last clean run;
+    # SYNC_ALL ignores (but still refreshes) that state
+    started = datetime.now(timezone.utc)
+    state_conn = open_sync_index(os.getenv("SYNC_INDEX_DB", DEFAULT_SYNC_INDEX_DB))
+    if "--rebuild" in sys.argv[1:]:
+        # Cached activities are never read back from Notion, so out-of-band
+        # edits and deletions are only picked up once the index is dropped
+        print("\n🔄 Rebuilding the local sync index from Notion")
+        clear_sync_index(state_conn)
+    
+    def section_days(section, overlap):
+        days = days_since_last_sync(state_conn, section, sync_days, overlap, started)
+        if not sync_all and days < sync_days:
+            print(f"   {section}: last clean sync {load_last_sync(state_conn, section):%Y-%m-%d %H:%M} UTC, checking {days} days")
+        return days
+    
+    def section_done(section, database_id, errors):
+        # Keep the old timestamp after errors so the gap is retried
+        if database_id and not errors:
+            save_last_sync(state_conn, section, started)
+    
+    # Run all syncs with the SAME Garmin session, side by side: they write to
+    # separate databases and share the Notion rate limiter.
+    # (state key or None, database, sync function, arguments)
+    sections = (
+        ("activities", activities_db, sync_activities,
+         (garmin, notion, activities_db, section_days("activities", 1), sync_all)),
+        (None, pr_db, sync_personal_records, (garmin, notion, pr_db)),
+        ("steps", steps_db, sync_daily_steps,
+         (garmin, notion, steps_db, section_days("steps", 2), sync_all)),
+        ("sleep", sleep_db, sync_sleep_data,
+         (garmin, notion, sleep_db, section_days("sleep", 2), sync_all)),
+    )
+    
     total_created = 0
     total_errors = 0
     
-    # 1. Activities (main)
-    c, u, e = sync_activities(garmin, notion, activities_db, sync_days, sync_all)
-    total_created += c
-    total_errors += e
-    
-    # 2. Personal Records
-    c, u, e = sync_personal_records(garmin, notion, pr_db)
-    total_created += c
-    total_errors += e
-    
-    # 3. Daily Steps
-    c, s, e = sync_daily_steps(garmin, notion, steps_db, sync_days, sync_all)
-    total_created += c
-    total_errors += e
-    
-    # 4. Sleep Data
-    c, s, e = sync_sleep_data(garmin, notion, sleep_db, sync_days, sync_all)
-    total_created += c
-    total_errors += e
+    console = SectionConsole(sys.stdout)
+    sys.stdout = console
+    try:
+        with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+            futures = {
+                executor.submit(console.run_labelled, sync.__name__.removeprefix("sync_"), sync, *args):
+                    (state_key, database_id, sync)
+                for state_key, database_id, sync, args in sections
+            }
+            for future in as_completed(futures):
+                state_key, database_id, sync = futures[future]
+                try:
+                    c, _, e = future.result()
+                except Exception as ex:
+                    print(f"\n❌ {sync.__name__} failed: {ex}")
+                    c, e = 0, 1
+                if state_key:
+                    section_done(state_key, database_id, e)
+                total_created += c
+                total_errors += e
+    finally:
+        sys.stdout = console.stream
+    
+    state_conn.close()
     
     # Final summary
     print("\n" + "=" * 60)